@@ -1,157 +1,120 @@
-"""This file is for all Asteroid classes, which generates and tracks asteroids in the game."""
-
-import arcade
-import random
-import math
-import constants
-from flying_objects import Flying_Objects
-from abc import abstractmethod
-
-class Asteroid(Flying_Objects):
-    """An abstract, flying_object class for asteroids."""
-    def __init__(self):
-        """Calls super; initiazlies radius, spin, speed, and angle."""
-        super().__init__()
-        self._radius = 0
-        self._spin = 0
-        self._angle = math.degrees(random.randint(0, 360))
-        
-    def advance(self):
-        """Handles the advancing and rotating of asteroids."""
-        super().advance()
-        self._angle += self._spin
-        
-    def draw(self):
-        """Draws asteroid based on texture loaded."""
-        width, height, alpha, texture = self._texture
-        
-        arcade.draw_texture_rectangle(self._center.x, self._center.y, width, height, texture, self._angle, alpha)
-    
-    @abstractmethod
-    def break_apart(self):
-        """Handles the destruction and breaking apart of asteroids."""
-        pass
-    
-    #Getter and setter properties listed here    
-    @property
-    def radius(self):
-        return self._radius
-
-    @radius.setter
-    def radius(self, radius):
-        self._radius = radius
-        
-    @property
-    def spin(self):
-        return self._spin
-    
-    @spin.setter
-    def spin(self, spin):
-        self._spin = spin
-        
-    
-class Big_Rock(Asteroid):
-    """An asteroid class for a big rock."""
-    def __init__(self):
-        """Calls the super init method, then sets the rock attributes to the global constants.
-        Also sets position of the asteroid to a random location, besides around the ship.
-        Initializes velocity based on random angle given, followed by the image texture."""
-        super().__init__()
-        self._radius = constants.BIG_ROCK_RADIUS
-        self._spin = constants.BIG_ROCK_SPIN
-        self._speed = constants.BIG_ROCK_SPEED
-        # Sets a random location on the screen, except for a square of space in the center, to make room for the ship
-        self._center.x = random.choice([i for i in range(0, constants.SCREEN_WIDTH) if i not in \
-                range(int(constants.SCREEN_WIDTH / 2 - (self._radius * 2)), int(constants.SCREEN_WIDTH / 2 + (self._radius * 2)))])
-        self._center.y = random.choice([i for i in range(0, constants.SCREEN_HEIGHT) if i not in \
-                range(int(constants.SCREEN_HEIGHT / 2 - (self._radius * 2)), int(constants.SCREEN_HEIGHT / 2 + (self._radius * 2)))])
-        # Sets velocity based on random angle that is initialized
-        self._velocity.dx = math.cos(math.radians(self._angle)) * self._speed
-        self._velocity.dy = math.sin(math.radians(self._angle)) * self._speed
-        self._texture = self.load_texture(":resources:images/space_shooter/meteorGrey_big1.png")
-        
-    def break_apart(self):
-        """Accepts the current list of asteroids from game.
-        Breaks into 2 medium rocks, and one small. Sets attributes for each rock.
-        Returns asteroids list with new asteroids."""
-        medium_rock_1 = Medium_Rock()
-        medium_rock_2 = Medium_Rock()
-        small_rock = Small_Rock()
-        
-        # Set first medium rock with current velocity + 2 pixels/frame in the upwards direction
-        medium_rock_1.velocity.dy = self._velocity.dy + 2
-        medium_rock_1.velocity.dx = self._velocity.dx
-        medium_rock_1.center.x = self._center.x
-        medium_rock_1.center.y = self._center.y
-        
-        # Set second medium rock with current velocity + 2 pixels/frame in the downwards direction
-        medium_rock_2.velocity.dy = self._velocity.dy - 2
-        medium_rock_2.velocity.dx = self._velocity.dx
-        medium_rock_2.center.x = self._center.x
-        medium_rock_2.center.y = self._center.y
-        
-        # Set small rock with current velocity + 5 pixels/frame in the right direction
-        small_rock.velocity.dy = self._velocity.dy
-        small_rock.velocity.dx = self._velocity.dx + 5
-        small_rock.center.x = self._center.x
-        small_rock.center.y = self._center.y
-        
-        # Kills asteroid, returns list of new asteroids
-        self.alive = False
-        return [medium_rock_1, medium_rock_2, small_rock]
-    
-    # Getter and setter properties listed below
-    @property
-    def speed(self):
-        return self._speed
-    
-    @speed.setter
-    def speed(self, speed):
-        self._speed = speed
-    
-class Medium_Rock(Asteroid):
-    """An asteroid class for a medium rock."""
-    def __init__(self):
-        """Calls super init method, followed by setting the appropriate attributes for the medium rock."""
-        super().__init__()
-        self._spin = constants.MEDIUM_ROCK_SPIN
-        self._radius = constants.MEDIUM_ROCK_RADIUS
-        self._texture = self.load_texture(":resources:images/space_shooter/meteorGrey_med1.png")
-        
-    def break_apart(self):
-        """Accepts the current list of asteroids from game.
-        Breaks into 2 small rocks. Sets attributes for each rock.
-        Returns asteroids list with new asteroids."""
-        small_rock_1 = Small_Rock()
-        small_rock_2 = Small_Rock()
-        
-        # Set first small rock with current velocity + 1.5 pixels/frame in the up and right directions
-        small_rock_1.velocity.dx = self._velocity.dx + 1.5
-        small_rock_1.velocity.dy = self._velocity.dy + 1.5
-        small_rock_1.center.x = self._center.x
-        small_rock_1.center.y = self._center.y
-        
-        # Set second small rock with current velocity -1.5 pixels/frame in the down and left directions
-        small_rock_2.velocity.dx = self._velocity.dx - 1.5
-        small_rock_2.velocity.dy = self._velocity.dy - 1.5
-        small_rock_2.center.x = self._center.x
-        small_rock_2.center.y = self._center.y
-        
-        # Kills asteroid, returns list of new asteroids
-        self._alive = False
-        return [small_rock_1, small_rock_2]
-        
-    
-class Small_Rock(Asteroid):
-    """An asteroid class for a small rock."""
-    def __init__(self):
-        """Calls super init method, followed by setting the appropriate attributes for the small rock."""
-        super().__init__()
-        self._spin = constants.SMALL_ROCK_SPIN
-        self._radius = constants.SMALL_ROCK_RADIUS
-        self._texture = self.load_texture(":resources:images/space_shooter/meteorGrey_small1.png")
-        
-    def break_apart(self):
-        """Sets alive attribute to False, and returns a list version of the asteroid."""
-        self._alive = False
-        return [self]
\ No newline at end of file
+"""This file is for all Asteroid classes, which generates and tracks asteroids in the game."""
+
+import math
+import constants
+from entity_store import Entity_Handle
+from hitboxes import load_hitbox
+from spawn_sampler import spawn_point
+from trig_table import unit_vector
+
+class Asteroid(Entity_Handle):
+    """An abstract, flying_object class for asteroids.
+    Position, velocity, angle, spin and radius are kept in a row of the given Entity_Store;
+    advancing and rotating is done by the store. The row's shape is the number of the rock's hit shape,
+    and its radius that of the circle around it.
+    Attributes are set in spawn rather than __init__, so pooled rocks can be spawned again.
+    Random choices come from the world's random.Random, so a seeded world always plays out the same."""
+    # Class, and nudge to x and y velocity, of each rock this one breaks into; filled in below the classes
+    fragments = ()
+    __slots__ = ("_rng",)
+
+    def spawn(self, store, rng):
+        """Calls super; initiazlies radius, spin, speed, and angle.
+        Keeps rng for the fragments made when the rock breaks apart."""
+        super().spawn(store)
+        self._rng = rng
+        hitbox = load_hitbox(self.texture_path)
+        self.shape = hitbox.index
+        self.radius = hitbox.radius
+        self.angle = math.degrees(rng.randint(0, 360))
+
+    def restore(self, store, index, rng):
+        """Calls super; keeps rng for the fragments made when the rock breaks apart."""
+        super().restore(store, index)
+        self._rng = rng
+        
+    def break_apart(self, room=None):
+        """Kills the asteroid, and returns the smaller rocks it breaks into.
+        Each fragment in the class's fragments table starts where this rock was, with its velocity plus the table's nudge.
+        :param room: most fragments to spawn, for keeping the world within its entity budget; None spawns them all
+        """
+        fragments = self.fragments if room is None else self.fragments[:max(room, 0)]
+        spawned = []
+        for fragment_class, nudge_x, nudge_y in fragments:
+            rock = self._store.spawn(fragment_class, self._rng)
+            rock.velocity.dx = self.dx + nudge_x
+            rock.velocity.dy = self.dy + nudge_y
+            rock.center.x = self.x
+            rock.center.y = self.y
+            spawned.append(rock)
+
+        self.alive = False
+        return spawned
+
+
+class Big_Rock(Asteroid):
+    """An asteroid class for a big rock."""
+    texture_path = ":resources:images/space_shooter/meteorGrey_big1.png"
+    # Score for shooting this rock
+    points = constants.BIG_ROCK_POINTS
+    __slots__ = ("_speed",)
+
+    def spawn(self, store, rng, safe_x=constants.SCREEN_WIDTH / 2, safe_y=constants.SCREEN_HEIGHT / 2,
+              speed=constants.BIG_ROCK_SPEED):
+        """Calls the super spawn method, then sets the rock attributes to the global constants.
+        Also sets position of the asteroid to a random location, besides around the safe point (the ship).
+        Initializes velocity based on random angle given, at the given speed; later waves send faster rocks."""
+        super().spawn(store, rng)
+        self.spin = constants.BIG_ROCK_SPIN
+        self._speed = speed
+        # Sets a random location on the screen, except for a band of space around the safe point, to make room for the ship
+        self.x, self.y = spawn_point(rng, self.radius, safe_x, safe_y)
+        # Sets velocity based on random angle that is initialized
+        direction = unit_vector(self.angle)
+        self.dx = direction[0] * self._speed
+        self.dy = direction[1] * self._speed
+
+    def restore(self, store, index, rng):
+        """Calls super; the rock's speed only sets its first velocity, so the default is kept."""
+        super().restore(store, index, rng)
+        self._speed = constants.BIG_ROCK_SPEED
+        
+    # Getter and setter properties listed below
+    @property
+    def speed(self):
+        return self._speed
+    
+    @speed.setter
+    def speed(self, speed):
+        self._speed = speed
+    
+class Medium_Rock(Asteroid):
+    """An asteroid class for a medium rock."""
+    texture_path = ":resources:images/space_shooter/meteorGrey_med1.png"
+    # Score for shooting this rock
+    points = constants.MEDIUM_ROCK_POINTS
+    __slots__ = ()
+
+    def spawn(self, store, rng):
+        """Calls super spawn method, followed by setting the appropriate attributes for the medium rock."""
+        super().spawn(store, rng)
+        self.spin = constants.MEDIUM_ROCK_SPIN
+        
+    
+class Small_Rock(Asteroid):
+    """An asteroid class for a small rock."""
+    texture_path = ":resources:images/space_shooter/meteorGrey_small1.png"
+    # Score for shooting this rock
+    points = constants.SMALL_ROCK_POINTS
+    __slots__ = ()
+
+    def spawn(self, store, rng):
+        """Calls super spawn method, followed by setting the appropriate attributes for the small rock."""
+        super().spawn(store, rng)
+        self.spin = constants.SMALL_ROCK_SPIN
+
+
+# A big rock breaks into two medium rocks going up and down, and a small rock going right
+Big_Rock.fragments = ((Medium_Rock, 0, 2), (Medium_Rock, 0, -2), (Small_Rock, 5, 0))
+# A medium rock breaks into two small rocks, going up and right, and down and left
+Medium_Rock.fragments = ((Small_Rock, 1.5, 1.5), (Small_Rock, -1.5, -1.5))
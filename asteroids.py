@@ -1,265 +1,290 @@
-"""
-File: asteroids.py
-Original Author: Br. Burton
-Designed to be completed by others
-This program implements the asteroids game.
-"""
-
-"""Completed by Jayden Thomas on 7/7/2021"""
-
-import arcade
-import constants
-from ship import Ship
-from asteroid_classes import Big_Rock
-from ship_lives_display import Ship_Lives
-
-# Global Constants are now contained in constants.py.
-# These was done to obtain easier access to constants in all class files.
-
-
-class Game(arcade.Window):
-    """
-    This class handles all the game callbacks and interaction
-    This class will then call the appropriate functions of
-    each of the above classes.
-    You are welcome to modify anything in this class.
-    """
-
-    def __init__(self, width, height):
-        """
-        Sets up the initial conditions of the game
-        :param width: Screen width
-        :param height: Screen height
-        """
-        super().__init__(width, height)
-        arcade.set_background_color(arcade.color.SMOKY_BLACK)
-
-        self.held_keys = set()
-        
-        self.ship = Ship()
-        
-        # Initializes a list containing Ship_Lives objects to represent the life count
-        self.lives_display = [Ship_Lives() for life in range(self.ship.lives)]
-        # Count variable and for loop adjusts position of lives so they are spaced out
-        count = 0
-        for life in self.lives_display:
-            life.center.x += (life.texture[0]) * count
-            count += 1
-
-        self.bullets = []
-        
-        # Creates asteroids list, populated based on the INITAL_ROCK_COUNT constant
-        self.asteroids = [Big_Rock() for number in range(constants.INITIAL_ROCK_COUNT)]
-            
-        # A counter for when the ship is destroyed that will delay the ship's respawn
-        self.reset_counter = 0
-        
-        # A list that is used for when the game_over screen needs to be displayed
-        self.game_over = []
-
-    def on_draw(self):
-        """
-        Called automatically by the arcade framework.
-        Handles the responsibility of drawing all elements.
-        """
-
-        # clear the screen to begin drawing
-        arcade.start_render()
-        
-        for bullet in self.bullets:
-            bullet.draw()
-            
-        for asteroid in self.asteroids:
-            asteroid.draw()
-        
-        self.ship.draw()
-        # Draws the lives at the top of the screen
-        for life in self.lives_display:
-            life.draw()
-        
-        # Draws the Game Over display, which is hidden until game_over conditions are met
-        for game_over in self.game_over:
-            game_over.draw()
-
-    def update(self, delta_time):
-        """
-        Update each object in the game.
-        :param delta_time: tells us how much time has actually elapsed
-        """
-        self.check_keys()
-        self.check_collisions()
-        self.check_off_screen()
-        self.check_resets()
-        
-        self.ship.advance()
-        
-        for bullet in self.bullets:
-            bullet.advance()
-        
-        for asteroid in self.asteroids:
-            asteroid.advance()
-    
-    def check_collisions(self):
-        """A function that checks if anything has collided."""
-        # Checks each asteroid against the current ship
-        for asteroid in self.asteroids:
-            if asteroid.alive and self.ship.alive:
-                too_close_ship = self.ship.radius + asteroid.radius
-                
-                if (abs(self.ship.center.x - asteroid.center.x) < too_close_ship and
-                    abs(self.ship.center.y - asteroid.center.y) < too_close_ship):
-                    self.ship.hit()
-                    self.lives_display.pop()
-                    
-            # Checks each individual bullet against each individual asteroid
-            for bullet in self.bullets:
-                
-                if bullet.alive and asteroid.alive:
-                    too_close_bullet = bullet.radius + asteroid.radius
-                    
-                    if (abs(bullet.center.x - asteroid.center.x) < too_close_bullet and
-                                abs(bullet.center.y - asteroid.center.y) < too_close_bullet):
-                        bullet.alive = False
-                        # Kills asteroid; adds smaller asteroids based on which asteroid was killed
-                        self.asteroids.extend(asteroid.break_apart())
-                        
-        # Cleans up any destroyed objects
-        self.cleanup_zombies()
-    
-    def check_off_screen(self):
-        """A function that check if anything is off_screen."""
-        for asteroid in self.asteroids:
-            if asteroid.is_off_screen():
-                asteroid.loop_object()
-        
-        for bullet in self.bullets:
-            if bullet.is_off_screen():
-                bullet.loop_object()
-
-        if self.ship.is_off_screen():
-            self.ship.loop_object()
-    
-    def cleanup_zombies(self):
-        """A function to remove dead objects."""
-        for asteroid in self.asteroids:
-            if not asteroid.alive:
-                self.asteroids.remove(asteroid)
-        
-        for bullet in self.bullets:
-            if not bullet.alive:
-                self.bullets.remove(bullet)
-                
-    def check_resets(self):
-        """If conditions are met, increments the reset_counter, and checks for ship or game reset."""
-        #If ship is dead
-        if not self.ship.alive:
-            self.reset_counter += 1
-            # If ship still has lives, prepare a reset of the ship
-            if self.reset_counter >= constants.RESET_COUNTER and self.ship.lives > 0:
-                self.ship.reset()
-                self.reset_counter = 0
-            # Checks for game over due to ship's total destruction
-            self.try_end_game()
-        # If all asteroids are destoyed
-        elif len(self.asteroids) == 0:
-            self.reset_counter += 1
-            # Check for game over due to asteroids' destruction
-            self.try_end_game()
-
-    def check_keys(self):
-        """
-        This function checks for keys that are being held down.
-        You will need to put your own method calls in here.
-        Parameters are positive to indicate one direction; negative for the opposite.
-        """
-        if arcade.key.LEFT in self.held_keys:
-            self.ship.turn(1)
-
-        if arcade.key.RIGHT in self.held_keys:
-            self.ship.turn(-1)
-
-        if arcade.key.UP in self.held_keys:
-            self.ship.thrust(1)
-
-        if arcade.key.DOWN in self.held_keys:
-            self.ship.thrust(-1)
-
-        # Machine gun mode...
-        if arcade.key.SPACE in self.held_keys:
-            # Check if the firing cooldown is good, then fire
-            if self.ship.firing_cooldown >= constants.FIRING_COOLDOWN:
-                self.bullets.append(self.ship.fire())
-                
-
-    def on_key_press(self, key: int, modifiers: int):
-        """
-        Puts the current key in the set of keys that are being held.
-        You will need to add things here to handle firing the bullet.
-        """
-                
-        if self.ship.alive:
-            self.held_keys.add(key)
-
-            # Fire bullet!
-            if key == arcade.key.SPACE:
-                self.bullets.append(self.ship.fire())
-        # If the ship is completely dead, look for the Enter button being pressed
-        elif self.ship.lives == 0:
-            if key == arcade.key.ENTER:
-                # Clears the game_over screen, and resets major components of the game
-                self.game_over.clear()
-                self.reset_counter = 0
-                self.reset_game()
-
-    def on_key_release(self, key: int, modifiers: int):
-        """
-        Removes the current key from the set of held keys.
-        """
-        if key in self.held_keys:
-            self.held_keys.remove(key)
-            
-            # Causes thrusters to disappear
-            if key == arcade.key.UP or key == arcade.key.DOWN:
-                self.ship.thrusters_on = False
-                
-    def try_end_game(self):
-        """If reset_counter criteria is reached:
-        begins the game over setup, and displays the game over screen."""
-        if self.reset_counter >= constants.GAME_RESET_COUNTER:
-            # Game over is displayed, and all items cleared
-            self.asteroids.clear()
-            self.ship.alive = False
-            self.ship.lives = 0
-            self.game_over.append(Game_Over())
-                
-    def reset_game(self):
-        """Resets ship, life_count, and asteroids for a new game."""
-        self.ship.reset()
-        
-        self.ship.lives = constants.SHIP_LIVES
-        self.lives_display = [Ship_Lives() for life in range(self.ship.lives)]
-        # Count variable and for loop adjusts position of lives so they are spaced out
-        count = 0
-        for life in self.lives_display:
-            life.center.x += (life.texture[0]) * count
-            count += 1
-            
-        self.asteroids = [Big_Rock() for number in range(constants.INITIAL_ROCK_COUNT)]
-    
-
-class Game_Over:
-    """A class responsible for creating a game_over screen when either the ship is out of lives,
-    or all asteroids are destroyed."""
-    
-    def draw(self):
-        """Draws text at the center of the screen to indicate that the game has ended."""
-        arcade.draw_text("Game Over", constants.SCREEN_WIDTH / 2, constants.SCREEN_HEIGHT / 2 + 10,
-                        arcade.color.WHITE, 20, width=200, align="center",
-                        anchor_x="center", anchor_y="center")
-        arcade.draw_text("Press Enter to Restart", constants.SCREEN_WIDTH / 2,
-                        constants.SCREEN_HEIGHT / 2 - 10, arcade.color.WHITE, 14,
-                        width=300, align="center", anchor_x="center", anchor_y="center")
-    
-# Creates the game and starts it going
-window = Game(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
-arcade.run()
+"""
+File: asteroids.py
+Original Author: Br. Burton
+Designed to be completed by others
+This program implements the asteroids game.
+"""
+
+"""Completed by Jayden Thomas on 7/7/2021"""
+
+import time
+# Taken before the imports below, so the time to the first frame includes loading them
+STARTED = time.perf_counter()
+
+import random
+import arcade
+import constants
+import textures
+from world import World
+from renderer import Renderer, Sprite_Renderer
+from timestep import Fixed_Timestep
+from replay import Input_Log
+from hud import Hud
+
+# Global Constants are now contained in constants.py.
+# These was done to obtain easier access to constants in all class files.
+
+# Maps keyboard keys onto the inputs understood by World.step
+KEY_INPUTS = {
+    arcade.key.LEFT: constants.INPUT_TURN_LEFT,
+    arcade.key.RIGHT: constants.INPUT_TURN_RIGHT,
+    arcade.key.UP: constants.INPUT_THRUST,
+    arcade.key.DOWN: constants.INPUT_REVERSE,
+    arcade.key.SPACE: constants.INPUT_FIRE,
+    arcade.key.ENTER: constants.INPUT_RESTART,
+}
+
+# Shows or hides the performance overlay, and writes its trace to TRACE_FILE
+PERF_HUD_KEY = arcade.key.F3
+TRACE_KEY = arcade.key.F4
+# Saves the session so far to REPLAY_FILE, for replay.py
+SAVE_REPLAY_KEY = arcade.key.F5
+
+
+class Game(arcade.Window):
+    """
+    This class handles all the game callbacks and interaction.
+    The rules of the game live in a World; this class turns keys into inputs for it,
+    steps it, and draws it.
+    """
+
+    def __init__(self, width, height, started=None, session=None):
+        """
+        Sets up the initial conditions of the game
+        :param width: Screen width
+        :param height: Screen height
+        :param started: perf_counter time the program started, for measuring the time to the first frame
+        :param session: a Lockstep_Session to play a networked game through, instead of a world of our own
+        """
+        super().__init__(width, height, update_rate=1 / constants.RENDER_RATE)
+        arcade.set_background_color(arcade.color.SMOKY_BLACK)
+
+        # Decodes every image on a background thread; a loading screen is drawn until they are all ready
+        self.loader = textures.Texture_Loader(Renderer.texture_paths)
+        self.loading_screen = Loading_Screen()
+        self.started = started if started is not None else time.perf_counter()
+        # Seconds from the start to the first frame drawn, and to the first frame of the game itself
+        self.first_frame_time = None
+        self.ready_time = None
+
+        self.held_keys = set()
+        # Inputs pressed since the last update, which act once rather than while held
+        self.pressed_inputs = 0
+
+        # Every session gets its own seed, recorded with its inputs so it can be replayed exactly;
+        # a networked game shares its world's seed with the other players, and steps through the session
+        self.session = session
+        if session:
+            self.world = session.world
+            self.player = session.player
+        else:
+            self.world = World(random.getrandbits(63))
+            self.player = 0
+        self.input_log = Input_Log(self.world.seed, self.world.endless, self.world.budget)
+        # Runs the world at a fixed tick rate, however often frames are drawn
+        self.timestep = Fixed_Timestep(constants.SIMULATION_RATE, constants.MAX_CATCH_UP_TICKS)
+        if constants.BATCHED_RENDERING:
+            self.renderer = Sprite_Renderer()
+        else:
+            self.renderer = Renderer()
+
+        # Each player's lives and score, filled in once the little ship's image is loaded
+        self.hud = Hud(len(self.world.players))
+
+        # Overlays drawn in some of the world's states: game over, and the wait before the next wave
+        self.game_over = Game_Over()
+        self.wave_banner = Wave_Banner()
+
+        # Created when the performance overlay is switched on; nothing is timed while it is None
+        self.profiler = None
+        self.perf_hud = None
+
+    def on_draw(self):
+        """
+        Called automatically by the arcade framework.
+        Handles the responsibility of drawing all elements.
+        """
+
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter() - self.started
+
+        if self.loader:
+            arcade.start_render()
+            self.loading_screen.draw(self.loader.loaded, self.loader.total)
+            return
+
+        if self.ready_time is None:
+            self.ready_time = time.perf_counter() - self.started
+
+        if self.profiler:
+            self.profiler.start()
+        self.renderer.start_frame()
+
+        # clear the screen to begin drawing
+        arcade.start_render()
+
+        # Draws objects part way between the last two ticks, by the time left over in the timestep
+        self.renderer.draw(self.world, self.timestep.blend)
+
+        # Draws the lives and scores at the top of the screen
+        self.renderer.draw_calls += self.hud.draw()
+
+        # Draws the overlay for the world's state, if it has one; each is a single draw whatever the state's age
+        state = self.world.state
+        if state == constants.STATE_GAME_OVER:
+            self.game_over.draw()
+        elif state == constants.STATE_WAVE_CLEAR and self.world.endless:
+            self.wave_banner.draw(self.world.wave + 1)
+
+        if self.profiler:
+            self.profiler.mark("on_draw", "render")
+            self.profiler.count("draw_calls", self.renderer.draw_calls)
+            # Startup times go to the overlay and trace rather than to stdout
+            self.profiler.count("first_frame_ms", round(self.first_frame_time * 1000))
+            self.profiler.count("ready_ms", round(self.ready_time * 1000))
+            self.perf_hud.draw()
+
+    def update(self, delta_time):
+        """
+        Update each object in the game.
+        :param delta_time: tells us how much time has actually elapsed
+        """
+        # Nothing moves until every image is loaded
+        if self.loader:
+            if self.loader.error:
+                raise self.loader.error
+            if not self.loader.done:
+                return
+            self.loader = None
+
+        held = 0
+        for key in self.held_keys:
+            held |= KEY_INPUTS.get(key, 0)
+
+        # Runs as many fixed ticks as the elapsed time covers; presses act on the first of them
+        ticks = self.timestep.advance(delta_time)
+        for tick in range(ticks):
+            if self.session:
+                # While the session waits on another player, presses are kept and the ticks left are owed to later frames
+                if not self.session.step(held, self.pressed_inputs):
+                    self.timestep.give_back(ticks - tick)
+                    break
+            else:
+                self.input_log.record(held, self.pressed_inputs)
+                self.world.step(held, self.pressed_inputs)
+            self.pressed_inputs = 0
+
+        # Only the lives and scores that changed this update are rebuilt
+        self.hud.sync(self.world)
+
+    def on_key_press(self, key: int, modifiers: int):
+        """
+        Puts the current key in the set of keys that are being held,
+        and passes it on to the world as a pressed input.
+        """
+        # Keys do nothing until the game has loaded
+        if self.loader:
+            return
+
+        # Keys are only held while this player's ship is alive
+        if self.world.players[self.player].ship.alive:
+            self.held_keys.add(key)
+
+        self.pressed_inputs |= KEY_INPUTS.get(key, 0)
+
+        if key == PERF_HUD_KEY:
+            self.toggle_profiler()
+        elif key == TRACE_KEY and self.profiler:
+            self.profiler.dump_trace(constants.TRACE_FILE)
+        elif key == SAVE_REPLAY_KEY and not self.session:
+            self.input_log.save(constants.REPLAY_FILE, self.world)
+
+    def toggle_profiler(self):
+        """Switches the performance overlay, and the timing behind it, on or off.
+        The profiler is only imported the first time it is switched on."""
+        from profiler import Frame_Profiler
+        from perf_hud import Perf_Hud
+
+        if self.profiler:
+            self.profiler = None
+            self.perf_hud = None
+        else:
+            self.profiler = Frame_Profiler()
+            self.perf_hud = Perf_Hud(self.profiler)
+        self.world.profiler = self.profiler
+
+    def on_key_release(self, key: int, modifiers: int):
+        """
+        Removes the current key from the set of held keys.
+        """
+        if key in self.held_keys:
+            self.held_keys.remove(key)
+
+
+class Game_Over:
+    """A class responsible for creating a game_over screen when either the ship is out of lives,
+    or all asteroids are destroyed. Its text is laid out once and drawn as is every frame."""
+
+    def __init__(self):
+        """Lays out the game over text at the center of the screen."""
+        self._texts = [
+            arcade.Text("Game Over", constants.SCREEN_WIDTH / 2, constants.SCREEN_HEIGHT / 2 + 10,
+                        arcade.color.WHITE, 20, width=200, align="center",
+                        anchor_x="center", anchor_y="center"),
+            arcade.Text("Press Enter to Restart", constants.SCREEN_WIDTH / 2,
+                        constants.SCREEN_HEIGHT / 2 - 10, arcade.color.WHITE, 14,
+                        width=300, align="center", anchor_x="center", anchor_y="center"),
+        ]
+
+    def draw(self):
+        """Draws text at the center of the screen to indicate that the game has ended."""
+        for text in self._texts:
+            text.draw()
+
+
+class Wave_Banner:
+    """A class responsible for announcing the next wave of endless mode while the field is clear.
+    Its text is only laid out again when the wave number changes."""
+
+    def __init__(self):
+        """Lays out an empty banner at the center of the screen."""
+        self._wave = None
+        self._text = arcade.Text("", constants.SCREEN_WIDTH / 2, constants.SCREEN_HEIGHT / 2,
+                                 arcade.color.WHITE, 20, width=200, align="center",
+                                 anchor_x="center", anchor_y="center")
+
+    def draw(self, wave):
+        """Draws the number of the coming wave at the center of the screen."""
+        if wave != self._wave:
+            self._text.text = "Wave {}".format(wave)
+            self._wave = wave
+        self._text.draw()
+
+
+class Loading_Screen:
+    """A class responsible for showing how many images have loaded while the game starts up.
+    Its text is only laid out again when another image has loaded."""
+
+    def __init__(self):
+        """Lays out an empty progress line at the center of the screen."""
+        self._progress = None
+        self._text = arcade.Text("", constants.SCREEN_WIDTH / 2, constants.SCREEN_HEIGHT / 2,
+                                 arcade.color.WHITE, 14, width=300, align="center",
+                                 anchor_x="center", anchor_y="center")
+
+    def draw(self, loaded, total):
+        """Draws the loading progress at the center of the screen."""
+        if (loaded, total) != self._progress:
+            self._text.text = "Loading... {}/{}".format(loaded, total)
+            self._progress = (loaded, total)
+        self._text.draw()
+
+
+def main():
+    """Creates the game window and runs it until it is closed."""
+    Game(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT, STARTED)
+    arcade.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""This file runs many headless episodes of the game in parallel, for training bots and tuning the balance of the rules.
+Each episode is a seeded World driven by a policy instead of the keyboard, and its results are gathered per batch.
+Run it with: python batch_runner.py --episodes 1000 --policy aim_and_fire --json results.json"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import namedtuple
+import numpy as np
+import constants
+from world import World
+from entity_store import minimum_image
+
+# One episode to run: the world's seed, a policy(world) returning held and pressed INPUT_* flags,
+# the most ticks to run before stopping the episode, and whether the world plays endless waves
+Episode_Config = namedtuple("Episode_Config", "seed policy max_ticks endless", defaults=(False,))
+
+# Result fields that are summarized over a batch
+RESULT_FIELDS = ("score", "survival_ticks", "lives_lost", "ticks", "wave")
+
+
+def idle(world):
+    """Leaves the ship alone."""
+    return 0, 0
+
+
+def spin_and_fire(world):
+    """Turns and fires constantly."""
+    return constants.INPUT_TURN_LEFT | constants.INPUT_FIRE, 0
+
+
+def aim_and_fire(world):
+    """Turns towards the nearest rock and fires at it, without thrusting."""
+    ship = world.ship
+    store = world.asteroid_store
+    rows = store.live_indices()
+    if not ship.alive or not len(rows):
+        return 0, 0
+    # Aims the short way round, since bullets wrap across the edges too
+    offset_x = minimum_image(store.x[rows] - ship.center.x, constants.SCREEN_WIDTH)
+    offset_y = minimum_image(store.y[rows] - ship.center.y, constants.SCREEN_HEIGHT)
+    nearest = np.argmin(offset_x * offset_x + offset_y * offset_y)
+    # How far the nose has to turn to face the rock, from -180 to 180 degrees
+    bearing = math.degrees(math.atan2(offset_y[nearest], offset_x[nearest])) - (ship.angle + 90)
+    bearing = (bearing + 180) % 360 - 180
+    if bearing > constants.SHIP_TURN_AMOUNT:
+        return constants.INPUT_TURN_LEFT | constants.INPUT_FIRE, 0
+    if bearing < -constants.SHIP_TURN_AMOUNT:
+        return constants.INPUT_TURN_RIGHT | constants.INPUT_FIRE, 0
+    return constants.INPUT_FIRE, 0
+
+
+class Random_Policy:
+    """A policy that holds a random combination of inputs each tick.
+    It keeps its own random.Random, so the world's random numbers are left alone."""
+    def __init__(self, seed):
+        """Accepts the seed of the policy's random number generator."""
+        self._rng = random.Random(seed)
+        self._inputs = (constants.INPUT_TURN_LEFT | constants.INPUT_TURN_RIGHT | constants.INPUT_THRUST |
+                        constants.INPUT_REVERSE | constants.INPUT_FIRE)
+
+    def __call__(self, world):
+        """Returns random held inputs."""
+        return self._rng.getrandbits(5) & self._inputs, 0
+
+
+# Policies that can be chosen by name from the command line
+POLICIES = {
+    "idle": idle,
+    "spin_and_fire": spin_and_fire,
+    "aim_and_fire": aim_and_fire,
+    "random": Random_Policy,
+}
+
+
+def make_configs(episodes, seed, policy, max_ticks, endless=False):
+    """Returns configs for a batch of episodes, each with its own seed drawn from the batch's seed.
+    :param policy: a policy, or a policy class that is built with each episode's seed
+    """
+    rng = random.Random(seed)
+    configs = []
+    for number in range(episodes):
+        episode_seed = rng.getrandbits(63)
+        episode_policy = policy(episode_seed) if isinstance(policy, type) else policy
+        configs.append(Episode_Config(episode_seed, episode_policy, max_ticks, endless))
+    return configs
+
+
+def run_episode(config):
+    """Plays one episode headless, until the game is over or it runs out of ticks, and returns its results."""
+    world = World(config.seed, config.endless)
+    policy = config.policy
+    survival_ticks = 0
+    while world.tick < config.max_ticks and not world.game_over:
+        held, pressed = policy(world)
+        world.step(held, pressed)
+        if world.ship.alive:
+            survival_ticks += 1
+    return {
+        "seed": config.seed,
+        "score": world.score,
+        "survival_ticks": survival_ticks,
+        "lives_lost": world.lives_lost,
+        "ticks": world.tick,
+        "wave": world.wave,
+        "game_over": world.game_over,
+    }
+
+
+def run_batch(configs, processes=None, chunksize=None):
+    """Runs every episode, across a pool of worker processes unless processes is 1, and returns the results in order.
+    Episodes share nothing, so each worker only receives its configs and sends back small result dictionaries."""
+    if processes == 1:
+        return [run_episode(config) for config in configs]
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        # A few chunks per worker keeps every worker busy without sending one config at a time
+        chunksize = max(len(configs) // (processes * 4), 1)
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(run_episode, configs, chunksize)
+
+
+def aggregate(results):
+    """Returns the mean, standard deviation, min and max of each result field over a batch."""
+    summary = {"episodes": len(results), "games_over": sum(result["game_over"] for result in results)}
+    for field in RESULT_FIELDS:
+        values = np.array([result[field] for result in results], dtype=float)
+        if not len(values):
+            continue
+        summary[field] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def main():
+    """Parses the command line, runs a batch, and prints or saves the aggregated results."""
+    parser = argparse.ArgumentParser(description="Run headless asteroids episodes in parallel.")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="aim_and_fire")
+    parser.add_argument("--max-ticks", type=int, default=constants.SIMULATION_RATE * 60 * 5,
+                        help="ticks before an episode is stopped")
+    parser.add_argument("--endless", action="store_true", help="play endless waves instead of a single field")
+    parser.add_argument("--processes", type=int, help="worker processes; defaults to one per core")
+    parser.add_argument("--json", help="write the summary and every episode's results to this file")
+    options = parser.parse_args()
+
+    configs = make_configs(options.episodes, options.seed, POLICIES[options.policy], options.max_ticks,
+                           options.endless)
+    start = time.perf_counter()
+    results = run_batch(configs, options.processes)
+    elapsed = time.perf_counter() - start
+
+    summary = aggregate(results)
+    summary["seconds"] = elapsed
+    summary["ticks_per_second"] = sum(result["ticks"] for result in results) / elapsed if elapsed else None
+    if options.json:
+        with open(options.json, "w") as output:
+            json.dump({"summary": summary, "episodes": results}, output, indent=2)
+    else:
+        print("{} episodes in {:.2f}s ({:.0f} ticks/s)".format(
+            summary["episodes"], elapsed, summary["ticks_per_second"] or 0))
+        for field in RESULT_FIELDS:
+            if field in summary:
+                print("{:<15} mean {:>9.1f}  std {:>9.1f}  min {:>7.0f}  max {:>7.0f}".format(
+                    field, summary[field]["mean"], summary[field]["std"], summary[field]["min"], summary[field]["max"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""This file is a benchmark harness for the simulation's hot paths.
+Each scenario is seeded, runs a headless World, and reports ticks per second, latency percentiles
+for every phase of World.step, entity counts, pool counters and allocations,
+along with the bytes each kind of entity takes and how long a Vec_Env of many worlds takes to step.
+Run it with: python benchmark.py --json results.json"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import constants
+import textures
+from world import World
+from bullet import Bullet
+from ship import Ship
+from asteroid_classes import Big_Rock, Small_Rock
+from entity_store import Entity_Store
+from ship_lives_display import Ship_Lives
+from vec_env import Vec_Env, ACTIONS
+
+# Phases of World.step that are timed; cleanup_zombies and merge_small_rocks run inside check_collisions
+PHASES = ("check_presses", "check_keys", "check_collisions", "cleanup_zombies", "merge_small_rocks",
+          "check_resets", "advance")
+
+# Enough lives that the ship respawns for the whole run instead of ending the game
+BENCHMARK_LIVES = 10 ** 9
+
+# Bytes per entity before flying objects had __slots__, when each kept its attributes in a __dict__ and its position
+# and velocity in objects of their own. Measured by entity_memory below, run unchanged on the revision before
+# __slots__ were added, with 10000 of each; the figures hardly change with the count
+DICT_LAYOUT_BYTES = {"Ship": 424, "Bullet": 304, "Big_Rock": 304, "Small_Rock": 288, "Ship_Lives": 208,
+                     "store_row": 98}
+
+
+class Scenario:
+    """A class describing one benchmark: how to fill a fresh world, and what to do to it each tick."""
+    def __init__(self, name, size, setup, each_tick):
+        """Accepts the scenario's name and size, a setup(world, size) function,
+        and an each_tick(world, size) function that returns the held and pressed inputs for that tick."""
+        self._name = name
+        self._size = size
+        self._setup = setup
+        self._each_tick = each_tick
+
+    def build(self, seed):
+        """Returns a new world, seeded and filled for this scenario.
+        The global random module is seeded too, for the scenario's own choices."""
+        random.seed(seed)
+        world = World(seed)
+        world.ship.lives = BENCHMARK_LIVES
+        self._setup(world, self._size)
+        return world
+
+    def inputs(self, world):
+        """Returns the held and pressed inputs for the world's next tick."""
+        return self._each_tick(world, self._size)
+
+    # Getter properties are listed below
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def size(self):
+        return self._size
+
+
+def add_big_rocks(world, size):
+    """Adds size more big rocks to a world."""
+    world.spawn_wave(size)
+
+
+def no_inputs(world, size):
+    """Leaves the ship alone."""
+    return 0, 0
+
+
+def fire_constantly(world, size):
+    """Turns and fires a bullet every tick, the most Ship.fire is ever called by the rules."""
+    return constants.INPUT_TURN_LEFT | constants.INPUT_FIRE, constants.INPUT_FIRE
+
+
+def shoot_rocks(world, size):
+    """Drops a still bullet onto size random living rocks, so break_apart cascades every tick."""
+    living = [asteroid for asteroid in world.asteroids if asteroid.alive]
+    for asteroid in random.sample(living, min(size, len(living))):
+        bullet = world.bullet_store.spawn(Bullet)
+        bullet.center.x = asteroid.center.x
+        bullet.center.y = asteroid.center.y
+        world.bullets.append(bullet)
+    # Tops the field back up once the storm has cleared it
+    if not living:
+        add_big_rocks(world, size)
+    return 0, 0
+
+
+def default_scenarios(sizes):
+    """Returns the standard scenarios at each of the given sizes."""
+    scenarios = []
+    for size in sizes:
+        scenarios.append(Scenario("swarm", size, add_big_rocks, no_inputs))
+        scenarios.append(Scenario("bullet_stream", size, add_big_rocks, fire_constantly))
+        scenarios.append(Scenario("break_apart_storm", size, add_big_rocks,
+                                  lambda world, size: shoot_rocks(world, max(size // 10, 1))))
+    return scenarios
+
+
+def time_phases(world, timings):
+    """Wraps each timed phase of a world so every call appends its duration to timings[phase]."""
+    for phase in PHASES:
+        method = getattr(world, phase)
+        durations = timings.setdefault(phase, [])
+
+        def timed(*args, method=method, durations=durations):
+            start = time.perf_counter()
+            result = method(*args)
+            durations.append(time.perf_counter() - start)
+            return result
+
+        setattr(world, phase, timed)
+
+
+def percentiles(durations):
+    """Returns the mean and percentile latencies of a list of durations, in microseconds."""
+    if not durations:
+        return {}
+    micros = np.array(durations) * 1e6
+    return {
+        "mean": float(micros.mean()),
+        "p50": float(np.percentile(micros, 50)),
+        "p90": float(np.percentile(micros, 90)),
+        "p99": float(np.percentile(micros, 99)),
+        "max": float(micros.max()),
+    }
+
+
+def run_timing(scenario, ticks, seed):
+    """Runs a scenario with every phase timed, and returns its timing results."""
+    world = scenario.build(seed)
+    timings = {}
+    time_phases(world, timings)
+    step_durations = []
+    peak_bullets = 0
+    peak_asteroids = 0
+
+    gc.collect()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+    start = time.perf_counter()
+    for tick in range(ticks):
+        held, pressed = scenario.inputs(world)
+        step_start = time.perf_counter()
+        world.step(held, pressed)
+        step_durations.append(time.perf_counter() - step_start)
+        peak_bullets = max(peak_bullets, len(world.bullets))
+        peak_asteroids = max(peak_asteroids, len(world.asteroids))
+    elapsed = time.perf_counter() - start
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections_before
+
+    step_time = sum(step_durations)
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / step_time if step_time else None,
+        "step": percentiles(step_durations),
+        "phases": {phase: percentiles(timings[phase]) for phase in PHASES},
+        "peak_bullets": peak_bullets,
+        "peak_asteroids": peak_asteroids,
+        "gc_collections": collections,
+        "pools": world.pool_stats(),
+    }
+
+
+def run_allocations(scenario, ticks, seed):
+    """Runs a scenario again under tracemalloc, and returns the memory it allocated while stepping."""
+    world = scenario.build(seed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    for tick in range(ticks):
+        held, pressed = scenario.inputs(world)
+        world.step(held, pressed)
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    differences = after.compare_to(before, "filename")
+    return {
+        "ticks": ticks,
+        "net_bytes": sum(difference.size_diff for difference in differences),
+        "net_blocks": sum(difference.count_diff for difference in differences),
+        "peak_bytes": peak,
+    }
+
+
+def entity_memory(count):
+    """Returns the bytes each kind of entity takes, averaged over count of them.
+    Only the Python objects are counted; store arrays are grown beforehand, and reported per row on their own."""
+    textures.load_texture(Ship_Lives.texture_path)
+    kinds = {
+        "Ship": lambda store, rng: Ship(),
+        "Bullet": lambda store, rng: store.spawn(Bullet),
+        "Big_Rock": lambda store, rng: store.spawn(Big_Rock, rng),
+        "Small_Rock": lambda store, rng: store.spawn(Small_Rock, rng),
+        "Ship_Lives": lambda store, rng: Ship_Lives(),
+    }
+    memory = {}
+    for name, build in kinds.items():
+        # A first batch with the same random numbers loads textures and hit shapes and fills shared caches
+        # such as unit_vector's, so only what each entity holds on its own is counted, whatever the count
+        warm_up = Entity_Store(count)
+        rng = random.Random(1)
+        for number in range(count):
+            build(warm_up, rng)
+        store = Entity_Store(count)
+        kept = [None] * count
+        rng = random.Random(1)
+        gc.collect()
+        tracemalloc.start()
+        for number in range(count):
+            kept[number] = build(store, rng)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        memory[name] = size / count
+    store = Entity_Store(count)
+    memory["store_row"] = sum(value.nbytes for value in vars(store).values()
+                              if isinstance(value, np.ndarray)) / store.capacity
+    return memory
+
+
+def run_vec_env(worlds, ticks, seed):
+    """Steps a Vec_Env of the given number of worlds with random actions, and returns its step timings.
+    Times depend on the machine, so compare them with the platform the report records."""
+    env = Vec_Env(worlds, seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    durations = []
+    for tick in range(ticks):
+        actions = rng.integers(0, 2, (worlds, len(ACTIONS)))
+        start = time.perf_counter()
+        env.step(actions)
+        durations.append(time.perf_counter() - start)
+    return {"worlds": worlds, "ticks": ticks, "step": percentiles(durations)}
+
+
+def run_draw(scenario, ticks, seed, batched):
+    """Times drawing a scenario's world each tick in a hidden window, or returns None if no window can be opened."""
+    try:
+        import arcade
+        from renderer import Renderer, Sprite_Renderer
+        window = arcade.Window(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT, visible=False)
+    except Exception as error:
+        return {"skipped": str(error)}
+
+    world = scenario.build(seed)
+    renderer = Sprite_Renderer() if batched else Renderer()
+    durations = []
+    for tick in range(ticks):
+        held, pressed = scenario.inputs(world)
+        world.step(held, pressed)
+        start = time.perf_counter()
+        window.clear()
+        renderer.draw(world)
+        window.ctx.finish()
+        durations.append(time.perf_counter() - start)
+    window.close()
+    return percentiles(durations)
+
+
+def revision():
+    """Returns the current git commit, if the benchmark is run from a checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scenarios, ticks, seed, allocation_ticks, draw=False, memory_entities=10000, vec_worlds=1000, vec_ticks=100):
+    """Runs every scenario and returns the full report as a dictionary."""
+    results = []
+    for scenario in scenarios:
+        result = {"scenario": scenario.name, "size": scenario.size, "seed": seed}
+        result.update(run_timing(scenario, ticks, seed))
+        result["allocations"] = run_allocations(scenario, allocation_ticks, seed)
+        if draw:
+            result["draw_batched"] = run_draw(scenario, ticks, seed, True)
+            result["draw_immediate"] = run_draw(scenario, ticks, seed, False)
+        results.append(result)
+    return {
+        "revision": revision(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "memory_entities": memory_entities,
+        "bytes_per_entity": entity_memory(memory_entities),
+        "bytes_per_entity_dict_layout": DICT_LAYOUT_BYTES,
+        "vec_env": run_vec_env(vec_worlds, vec_ticks, seed) if vec_worlds else None,
+        "results": results,
+    }
+
+
+def main():
+    """Parses the command line, runs the benchmarks, and prints or saves the report."""
+    parser = argparse.ArgumentParser(description="Benchmark the asteroids simulation.")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks to time per scenario")
+    parser.add_argument("--allocation-ticks", type=int, default=120, help="ticks to trace allocations over")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="rocks per scenario")
+    parser.add_argument("--scenario", action="append", help="only run scenarios with this name")
+    parser.add_argument("--draw", action="store_true", help="also time drawing in a hidden window")
+    parser.add_argument("--memory-entities", type=int, default=10000, help="entities of each kind to measure")
+    parser.add_argument("--vec-worlds", type=int, default=1000, help="worlds to step in a Vec_Env, or 0 to skip it")
+    parser.add_argument("--vec-ticks", type=int, default=100, help="ticks to time the Vec_Env over")
+    parser.add_argument("--json", help="write the report to this file instead of printing it")
+    options = parser.parse_args()
+
+    scenarios = default_scenarios(options.sizes)
+    if options.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name in options.scenario]
+
+    report = run(scenarios, options.ticks, options.seed, options.allocation_ticks, options.draw,
+                 options.memory_entities, options.vec_worlds, options.vec_ticks)
+    if options.json:
+        with open(options.json, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        for result in report["results"]:
+            print("{:<18} {:>5} rocks  {:>9.0f} ticks/s  step p50 {:>8.1f}us  p99 {:>8.1f}us  alloc {:>9} B".format(
+                result["scenario"], result["size"], result["ticks_per_second"],
+                result["step"]["p50"], result["step"]["p99"], result["allocations"]["net_bytes"]))
+        print("bytes per entity over {} of each, now and with the dict layout: ".format(report["memory_entities"])
+              + "  ".join("{} {:.0f}/{}".format(name, size, DICT_LAYOUT_BYTES[name])
+                          for name, size in report["bytes_per_entity"].items()))
+        vec = report["vec_env"]
+        if vec:
+            print("Vec_Env {} worlds  step p50 {:.1f}ms  p99 {:.1f}ms  on {}".format(
+                vec["worlds"], vec["step"]["p50"] / 1000, vec["step"]["p99"] / 1000, report["platform"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,64 @@
-"""This file is for the Bullet class."""
-
-from flying_objects import Flying_Objects
-import math
-import arcade
-import constants
-
-class Bullet(Flying_Objects):
-    """A class for a bullet, which is a flying object."""
-    def __init__(self):
-        """Calls super; accepts radius, speed, and life to initialize aspects of the bullet."""
-        super().__init__()
-        self._radius = constants.BULLET_RADIUS
-        self._speed = constants.BULLET_SPEED
-        self._life = 0
-        self._texture = self.load_texture(":resources:images/space_shooter/laserBlue01.png")
-        
-    def draw(self):
-        """Loads the data from self._texture, then draws bullet."""
-        width, height, alpha, texture = self._texture
-        
-        arcade.draw_texture_rectangle(self._center.x, self._center.y, width, height, texture, self._angle, alpha)
-        
-    def advance(self):
-        """Calls super of parent class, and changes alive attribute if life is too high."""
-        super().advance()
-        self._life += 1
-        if self._life >= constants.BULLET_LIFE:
-            self._alive = False
-        
-    def on_fire(self, velocity_x, velocity_y):
-        """Changes velocity to match the current movement of the ship, in addition to bullet's speed."""
-        self._velocity.dx = (math.cos(math.radians(self._angle)) * self._speed) + velocity_x
-        self._velocity.dy = (math.sin(math.radians(self._angle)) * self._speed) + velocity_y
-        
-    # Getter and setter properties are listed below
-    @property
-    def radius(self):
-        return self._radius
-
-    @radius.setter
-    def radius(self, radius):
-        self._radius = radius
-    
-    @property
-    def speed(self):
-        return self._speed
-    
-    @speed.setter
-    def speed(self, speed):
-        self._speed = speed
-        
-    @property
-    def life(self):
-        return self._life
-    
-    @life.setter
-    def life(self, life):
-        self._life = life
\ No newline at end of file
+"""This file is for the Bullet class."""
+
+from entity_store import Entity_Handle
+from hitboxes import load_hitbox
+from trig_table import unit_vector
+import constants
+
+class Bullet(Entity_Handle):
+    """A class for a bullet, which is a flying object kept in a row of an Entity_Store.
+    Attributes are set in spawn rather than __init__, so pooled bullets can be fired again."""
+    texture_path = ":resources:images/space_shooter/laserBlue01.png"
+    __slots__ = ("_speed", "_owner")
+
+    def spawn(self, store):
+        """Calls super; accepts radius, speed, and life to initialize aspects of the bullet."""
+        super().spawn(store)
+        # The laser's hit shape, and the circle around it that is checked before the shape itself
+        hitbox = load_hitbox(self.texture_path)
+        self.shape = hitbox.index
+        self.radius = hitbox.radius
+        self._speed = constants.BULLET_SPEED
+        self.life = 0
+        # Number of the player whose ship fired the bullet, who scores what it hits
+        self._owner = 0
+
+    def restore(self, store, index):
+        """Calls super; sets the speed and owner spawn would."""
+        super().restore(store, index)
+        self._speed = constants.BULLET_SPEED
+        self._owner = 0
+        
+    def advance(self):
+        """Calls super of parent class, and changes alive attribute if life is too high.
+        Worlds age a whole store at once with Entity_Store.age instead."""
+        super().advance()
+        self.life += 1
+        if self.life >= constants.BULLET_LIFE:
+            self.alive = False
+        
+    def on_fire(self, velocity_x, velocity_y, direction=None):
+        """Changes velocity to match the current movement of the ship, in addition to bullet's speed.
+        :param direction: the cosine and sine of the bullet's angle, if the caller already has them
+        """
+        if direction is None:
+            direction = unit_vector(self.angle)
+        self.dx = (direction[0] * self._speed) + velocity_x
+        self.dy = (direction[1] * self._speed) + velocity_y
+        
+    # Getter and setter properties are listed below
+    @property
+    def speed(self):
+        return self._speed
+    
+    @speed.setter
+    def speed(self, speed):
+        self._speed = speed
+        
+    @property
+    def owner(self):
+        return self._owner
+    
+    @owner.setter
+    def owner(self, owner):
+        self._owner = owner
@@ -1,27 +1,85 @@
-# These are Global constants to use throughout the game of asteroids.py
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-GAME_RESET_COUNTER = 100
-
-BULLET_RADIUS = 30
-BULLET_SPEED = 10
-BULLET_LIFE = 60
-
-SHIP_TURN_AMOUNT = 3
-SHIP_THRUST_AMOUNT = 0.25
-SHIP_RADIUS = 30
-SHIP_LIVES = 3
-FIRING_COOLDOWN = 10
-RESET_COUNTER = 50
-
-INITIAL_ROCK_COUNT = 5
-
-BIG_ROCK_SPIN = 1
-BIG_ROCK_SPEED = 1.5
-BIG_ROCK_RADIUS = 15
-
-MEDIUM_ROCK_SPIN = -2
-MEDIUM_ROCK_RADIUS = 5
-
-SMALL_ROCK_SPIN = 5
-SMALL_ROCK_RADIUS = 2
\ No newline at end of file
+# These are Global constants to use throughout the game of asteroids.py
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+# Speeds and counters below are per simulation tick, tuned for 60 ticks a second
+SIMULATION_RATE = 60
+# Frames drawn per second, independent of the simulation rate
+RENDER_RATE = 60
+# Most ticks one frame may run when catching up after a slow frame
+MAX_CATCH_UP_TICKS = 5
+# Draws each kind of object as one sprite batch; False draws every object with its own call, for comparison
+BATCHED_RENDERING = True
+# Frames between refreshes of the performance overlay's text
+PERF_HUD_REFRESH = 15
+# Where the performance overlay's trace is written
+TRACE_FILE = "asteroids_trace.json"
+# Where a recording of the session's inputs is written
+REPLAY_FILE = "asteroids.replay"
+# Hit shapes worked out from each image's alpha channel, kept beside the modules so no run has to trace them
+HITBOX_CACHE = "hitboxes.json"
+# Alpha above which a pixel counts as solid, and the most corners a hit shape is simplified to
+HITBOX_ALPHA_THRESHOLD = 64
+HITBOX_MAX_VERTICES = 12
+# Most pairs of hit shapes given the exact test at once, among those still alive when a hit is resolved
+HITBOX_BATCH = 64
+# Hand-set sizes below only place bullets in front of the ship; collisions use each texture's hit shape
+GAME_RESET_COUNTER = 100
+
+BULLET_RADIUS = 30
+BULLET_SPEED = 10
+BULLET_LIFE = 60
+
+SHIP_TURN_AMOUNT = 3
+SHIP_THRUST_AMOUNT = 0.25
+SHIP_RADIUS = 30
+SHIP_LIVES = 3
+FIRING_COOLDOWN = 10
+RESET_COUNTER = 50
+
+INITIAL_ROCK_COUNT = 5
+# Endless mode sends a new wave a while after each one is cleared, instead of ending the game
+ENDLESS_MODE = False
+WAVE_DELAY = 100
+# Each wave has this many times the big rocks of the last, and they are this much faster, up to the top speed
+WAVE_ROCK_GROWTH = 1.5
+WAVE_SPEED_GROWTH = 0.1
+BIG_ROCK_MAX_SPEED = 4
+# Most asteroids a world keeps alive; rocks shot past it break into fewer fragments, or none
+ASTEROID_BUDGET = 3000
+# Share of the budget in use above which nearby small rocks are merged into one
+MERGE_FRACTION = 0.75
+# Small rocks closer than this are merged
+MERGE_DISTANCE = 8
+# Most released objects of each class an entity store keeps for reuse
+POOL_SIZE = 256
+
+# Steps in a full turn for the shared sine and cosine table
+TRIG_TABLE_STEPS = 3600
+
+BIG_ROCK_SPIN = 1
+BIG_ROCK_SPEED = 1.5
+BIG_ROCK_POINTS = 20
+
+MEDIUM_ROCK_SPIN = -2
+MEDIUM_ROCK_POINTS = 50
+
+SMALL_ROCK_SPIN = 5
+SMALL_ROCK_POINTS = 100
+
+# States of a World's game; every state costs the same each tick however long it lasts
+STATE_PLAYING = 0
+# Every ship is destroyed, and at least one is waiting to respawn
+STATE_RESPAWNING = 1
+# Every asteroid is destroyed, and the next wave or the end of the game is counting down
+STATE_WAVE_CLEAR = 2
+# The game has ended, and nothing changes until it is restarted
+STATE_GAME_OVER = 3
+STATE_NAMES = ("PLAYING", "RESPAWNING", "WAVE_CLEAR", "GAME_OVER")
+
+# Input flags given to World.step; held or pressed inputs are combined with |
+INPUT_TURN_LEFT = 1
+INPUT_TURN_RIGHT = 2
+INPUT_THRUST = 4
+INPUT_REVERSE = 8
+INPUT_FIRE = 16
+INPUT_RESTART = 32
@@ -0,0 +1,346 @@
+"""This file is for the Entity_Store class, which keeps the state of many flying objects in contiguous arrays,
+and for the handle class that lets those objects keep the usual center/velocity/alive interface."""
+
+import numpy as np
+import constants
+from flying_objects import Flying_Objects
+from pools import Object_Pool
+
+
+class Entity_Store:
+    """A class that stores one row per flying object in NumPy arrays, so a whole group can be advanced,
+    aged and tested for collisions in a few vectorized passes.
+    Rows are handed out from a free list, so a row keeps its index for as long as its object lives."""
+    def __init__(self, capacity=64, pool_size=constants.POOL_SIZE):
+        """Accepts the starting number of rows; the arrays double in size whenever they fill up.
+        Up to pool_size released objects of each class are kept for spawn to reuse."""
+        self._capacity = 0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.dx = np.zeros(0)
+        self.dy = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.spin = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.life = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        # Number of each row's hit shape in the hitboxes table
+        self.shape = np.zeros(0, dtype=np.int64)
+        # Position and angle as of the start of the last tick, for drawing between ticks
+        self.previous_x = np.zeros(0)
+        self.previous_y = np.zeros(0)
+        self.previous_angle = np.zeros(0)
+        # Order in which each row was filled; sorting by it gives the order objects were created in
+        self.serial = np.zeros(0, dtype=np.int64)
+        # Rows that currently belong to an object, whether that object is alive or not
+        self.used = np.zeros(0, dtype=bool)
+        self._handles = []
+        self._free = []
+        self._next_serial = 0
+        # Rows filled at or after this serial have no previous position yet
+        self._remembered_serial = 0
+        self._pool_size = pool_size
+        self._pools = {}
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Enlarges every array to hold at least the given number of rows."""
+        if capacity <= self._capacity:
+            return
+        extra = capacity - self._capacity
+        for name in ("x", "y", "dx", "dy", "angle", "spin", "radius", "life",
+                     "previous_x", "previous_y", "previous_angle"):
+            setattr(self, name, np.concatenate((getattr(self, name), np.zeros(extra))))
+        self.alive = np.concatenate((self.alive, np.zeros(extra, dtype=bool)))
+        self.serial = np.concatenate((self.serial, np.zeros(extra, dtype=np.int64)))
+        self.shape = np.concatenate((self.shape, np.zeros(extra, dtype=np.int64)))
+        self.used = np.concatenate((self.used, np.zeros(extra, dtype=bool)))
+        self._handles.extend([None] * extra)
+        # Lowest rows are handed out first
+        self._free.extend(range(capacity - 1, self._capacity - 1, -1))
+        self._free.sort(reverse=True)
+        self._capacity = capacity
+
+    def allocate(self, handle):
+        """Claims an empty row for a handle and returns its index."""
+        if not self._free:
+            self.grow(max(self._capacity * 2, 1))
+        index = self._free.pop()
+        self.x[index] = 0
+        self.y[index] = 0
+        self.dx[index] = 0
+        self.dy[index] = 0
+        self.angle[index] = 0
+        self.spin[index] = 0
+        self.radius[index] = 0
+        self.life[index] = 0
+        self.shape[index] = 0
+        self.alive[index] = True
+        self.used[index] = True
+        self.serial[index] = self._next_serial
+        self._next_serial += 1
+        self._handles[index] = handle
+        return index
+
+    def spawn(self, object_class, *args):
+        """Returns an object of the given class living in this store, reusing a released one when the pool has one."""
+        return self.pool(object_class).spawn(self, *args)
+
+    def restore(self, object_classes, *args):
+        """Empties the store, then gives its lowest rows to one object of each given class in turn, and returns them.
+        Unlike spawn, the rows and objects are not set up; the caller writes every row, as when restoring a snapshot.
+        Any further arguments are passed on to each object's restore."""
+        self.clear()
+        count = len(object_classes)
+        self.grow(count)
+        del self._free[len(self._free) - count:]
+        self.used[:count] = True
+        objects = [self.pool(object_class).restore(self, index, *args)
+                   for index, object_class in enumerate(object_classes)]
+        self._handles[:count] = objects
+        return objects
+
+    def pool(self, object_class):
+        """Returns the pool of released objects of a class, making it the first time the class is asked for."""
+        pool = self._pools.get(object_class)
+        if pool is None:
+            pool = Object_Pool(object_class, self._pool_size)
+            self._pools[object_class] = pool
+        return pool
+
+    def release(self, handle):
+        """Returns a handle's row to the free list, and the handle to its pool.
+        Releasing a handle twice does nothing."""
+        index = handle.index
+        if self._handles[index] is not handle:
+            return
+        pool = self._pools.get(type(handle))
+        if pool is not None:
+            pool.release(handle)
+        self._handles[index] = None
+        self.alive[index] = False
+        self.used[index] = False
+        self.dx[index] = 0
+        self.dy[index] = 0
+        self.spin[index] = 0
+        self._free.append(index)
+
+    def pool_stats(self):
+        """Returns the counters of every pool, keyed by class name."""
+        return {object_class.__name__: pool.stats() for object_class, pool in self._pools.items()}
+
+    def clear(self):
+        """Releases every row at once, handing every object back to its pool."""
+        for handle in self._handles:
+            if handle is not None:
+                pool = self._pools.get(type(handle))
+                if pool is not None:
+                    pool.release(handle)
+        self._handles = [None] * self._capacity
+        self.alive[:] = False
+        self.used[:] = False
+        self.dx[:] = 0
+        self.dy[:] = 0
+        self.spin[:] = 0
+        self._free = list(range(self._capacity - 1, -1, -1))
+
+    def set_serials(self, next_serial, remembered_serial):
+        """Sets the serial the next object will get, and the first serial that counts as fresh,
+        when a store is restored from a snapshot."""
+        self._next_serial = next_serial
+        self._remembered_serial = remembered_serial
+
+    def handle(self, index):
+        """Returns the object that owns a row."""
+        return self._handles[index]
+
+    def live_indices(self):
+        """Returns the rows of living objects, in the order the objects were created."""
+        indices = np.flatnonzero(self.alive)
+        return indices[np.argsort(self.serial[indices], kind="stable")]
+
+    def remember(self):
+        """Copies the current positions and angles, so frames drawn during the next tick can interpolate."""
+        np.copyto(self.previous_x, self.x)
+        np.copyto(self.previous_y, self.y)
+        np.copyto(self.previous_angle, self.angle)
+        self._remembered_serial = self._next_serial
+
+    def interpolate(self, blend):
+        """Returns x, y and angle arrays blended from the remembered state towards the current one.
+        Objects that wrapped are blended the short way across the edge; objects created since then are drawn where they are."""
+        x = self.previous_x + minimum_image(self.x - self.previous_x, constants.SCREEN_WIDTH) * blend
+        x %= constants.SCREEN_WIDTH
+        y = self.previous_y + minimum_image(self.y - self.previous_y, constants.SCREEN_HEIGHT) * blend
+        y %= constants.SCREEN_HEIGHT
+        angle = self.previous_angle + (self.angle - self.previous_angle) * blend
+        snap = self.serial >= self._remembered_serial
+        x[snap] = self.x[snap]
+        y[snap] = self.y[snap]
+        angle[snap] = self.angle[snap]
+        return x, y, angle
+
+    def motion(self):
+        """Returns dx and dy arrays of how far each object moved in the last advance.
+        Objects created since the last remember have not moved yet."""
+        fresh = self.serial >= self._remembered_serial
+        return np.where(fresh, 0.0, self.dx), np.where(fresh, 0.0, self.dy)
+
+    def advance(self):
+        """Moves every object by its velocity, wrapping around the screen's edges, and turns it by its spin."""
+        self.x += self.dx
+        self.x %= constants.SCREEN_WIDTH
+        self.y += self.dy
+        self.y %= constants.SCREEN_HEIGHT
+        self.angle += self.spin
+
+    def age(self, lifetime):
+        """Counts one frame of life for every object, killing those that reach the lifetime."""
+        self.life[self.used] += 1
+        self.alive &= self.life < lifetime
+
+    # Getter properties are listed below
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def count(self):
+        return self._capacity - len(self._free)
+
+    @property
+    def next_serial(self):
+        return self._next_serial
+
+    @property
+    def remembered_serial(self):
+        return self._remembered_serial
+
+
+def minimum_image(offset, length):
+    """Returns offsets along an axis of the given length shortened to the nearest copy across the wrapped edges,
+    so they fall between -length / 2 and length / 2. Works on single values and arrays."""
+    return offset - length * np.floor(offset / length + 0.5)
+
+
+class Entity_Handle(Flying_Objects):
+    """A flying object whose state lives in a row of an Entity_Store.
+    The usual properties read and write that row, so code written against Flying_Objects keeps working;
+    the handle itself only holds its store and row."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, *args):
+        """Spawns the object into the store. Any further arguments are passed on to spawn."""
+        self.spawn(store, *args)
+
+    def spawn(self, store):
+        """Claims a fresh row in the store.
+        Child classes extend this to set their starting attributes, so pooled objects can be spawned again."""
+        self._store = store
+        self._index = store.allocate(self)
+
+    def restore(self, store, index):
+        """Takes over a row of the store that is being restored, leaving its values alone.
+        Child classes extend this to set the attributes spawn would, besides the row's."""
+        self._store = store
+        self._index = index
+
+    def advance(self):
+        """Handles the advancement and rotation of this one object; worlds advance a whole store at once instead."""
+        store = self._store
+        store.x[self._index] = (store.x[self._index] + store.dx[self._index]) % constants.SCREEN_WIDTH
+        store.y[self._index] = (store.y[self._index] + store.dy[self._index]) % constants.SCREEN_HEIGHT
+        store.angle[self._index] += store.spin[self._index]
+
+    def release(self):
+        """Gives the object's row back to its store, once the object has left the world."""
+        self._store.release(self)
+
+    # Getter and setter properties are listed below
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def x(self):
+        return float(self._store.x[self._index])
+
+    @x.setter
+    def x(self, x):
+        self._store.x[self._index] = x
+
+    @property
+    def y(self):
+        return float(self._store.y[self._index])
+
+    @y.setter
+    def y(self, y):
+        self._store.y[self._index] = y
+
+    @property
+    def dx(self):
+        return float(self._store.dx[self._index])
+
+    @dx.setter
+    def dx(self, dx):
+        self._store.dx[self._index] = dx
+
+    @property
+    def dy(self):
+        return float(self._store.dy[self._index])
+
+    @dy.setter
+    def dy(self, dy):
+        self._store.dy[self._index] = dy
+
+    @property
+    def alive(self):
+        return bool(self._store.alive[self._index])
+
+    @alive.setter
+    def alive(self, alive):
+        self._store.alive[self._index] = alive
+
+    @property
+    def angle(self):
+        return float(self._store.angle[self._index])
+
+    @angle.setter
+    def angle(self, angle):
+        self._store.angle[self._index] = angle
+
+    @property
+    def spin(self):
+        return float(self._store.spin[self._index])
+
+    @spin.setter
+    def spin(self, spin):
+        self._store.spin[self._index] = spin
+
+    @property
+    def radius(self):
+        return float(self._store.radius[self._index])
+
+    @radius.setter
+    def radius(self, radius):
+        self._store.radius[self._index] = radius
+
+    @property
+    def life(self):
+        return float(self._store.life[self._index])
+
+    @life.setter
+    def life(self, life):
+        self._store.life[self._index] = life
+
+    @property
+    def shape(self):
+        return int(self._store.shape[self._index])
+
+    @shape.setter
+    def shape(self, shape):
+        self._store.shape[self._index] = shape
@@ -1,90 +1,123 @@
-"""This file is for the Flying_Objects class,
-containing the necessary attributes and methods that a moving object would need."""
-
-import math
-import constants
-import arcade
-from velocity import Velocity
-from point import Point
-from abc import ABC, abstractmethod
-
-class Flying_Objects(ABC):
-    """A class for flying objects."""
-    def __init__(self):
-        """Initalizes point and velocity objects, as well as life."""
-        self._center = Point()
-        self._velocity = Velocity()
-        self._alive = True
-        self._angle = math.degrees(0)
-        
-    def load_texture(self, img):
-        """A method to load the texture of the flying object."""
-        texture = arcade.load_texture(img)
-        
-        width = texture.width
-        height = texture.height
-        alpha = 255
-        return width, height, alpha, texture
-        
-    def advance(self):
-        """Handles the advancement of the objects center based on velocity."""
-        self._center.x += self._velocity.dx
-        self._center.y += self._velocity.dy
-        
-    def loop_object(self):
-        """Changes object location to the opposite edge of the screen if it moves beyond."""
-        if self.center.x >= constants.SCREEN_WIDTH:
-            self.center.x = 0
-        elif self.center.x <= 0:
-            self.center.x = constants.SCREEN_WIDTH
-        elif self.center.y >= constants.SCREEN_HEIGHT:
-            self.center.y = 0
-        elif self.center.y <= 0:
-            self.center.y = constants.SCREEN_HEIGHT
-        
-    def is_off_screen(self):
-        """Returns true if object exits screen parameters."""
-        off_screen = False
-        # If statement checks if objects goes off any side of screen
-        if self._center.x > constants.SCREEN_WIDTH or 0 > self._center.x or \
-           self._center.y > constants.SCREEN_HEIGHT or 0 > self._center.y:
-            off_screen = True
-        return off_screen
-        
-    @abstractmethod
-    def draw(self):
-        """An abstract drawing method, to be defined by child classes."""
-        pass
-    
-    # Getter and setter properties are listed below
-    @property
-    def center(self):
-        return self._center
-    
-    @center.setter
-    def center(self, center):
-        self._center = center
-        
-    @property
-    def velocity(self):
-        return self._velocity
-    
-    @velocity.setter
-    def velocity(self, velocity):
-        self._velocity = velocity
-        
-    @property
-    def alive(self):
-        return self._alive
-    
-    @alive.setter
-    def alive(self, alive):
-        self._alive = alive
-        
-    @property
-    def angle(self):
-        return self._angle
-    
-    @angle.setter
-    def angle(self, angle):
-        self._angle = angle
\ No newline at end of file
+"""This file is for the Flying_Objects class,
+containing the necessary attributes and methods that a moving object would need,
+and for the Inline_Object class, a flying object that keeps its state in its own slots."""
+
+import math
+import constants
+from abc import ABC
+
+class Flying_Objects(ABC):
+    """A class for flying objects.
+    Objects only hold simulation state; the resource path of their texture
+    is kept so a view can load and draw it.
+    Subclasses supply x, y, dx, dy, alive and angle; center and velocity return the object itself,
+    so center.x and velocity.dx read them without separate Point and Velocity objects."""
+    texture_path = None
+    __slots__ = ()
+        
+    def advance(self):
+        """Handles the advancement of the objects center based on velocity.
+        The screen is a torus, so the center wraps around to the opposite edge as it moves."""
+        self.x = (self.x + self.dx) % constants.SCREEN_WIDTH
+        self.y = (self.y + self.dy) % constants.SCREEN_HEIGHT
+        
+    def loop_object(self):
+        """Brings an object that is past any edge back onto the screen, on both axes at once."""
+        self.x %= constants.SCREEN_WIDTH
+        self.y %= constants.SCREEN_HEIGHT
+        
+    def is_off_screen(self):
+        """Returns true if object exits screen parameters."""
+        off_screen = False
+        # If statement checks if objects goes off any side of screen
+        if self.x > constants.SCREEN_WIDTH or 0 > self.x or \
+           self.y > constants.SCREEN_HEIGHT or 0 > self.y:
+            off_screen = True
+        return off_screen
+        
+    # Getter and setter properties are listed below
+    @property
+    def center(self):
+        return self
+    
+    @center.setter
+    def center(self, center):
+        self.x = center.x
+        self.y = center.y
+        
+    @property
+    def velocity(self):
+        return self
+    
+    @velocity.setter
+    def velocity(self, velocity):
+        self.dx = velocity.dx
+        self.dy = velocity.dy
+
+
+class Inline_Object(Flying_Objects):
+    """A flying object that keeps its position, velocity, angle and alive flag in its own slots."""
+    __slots__ = ("_x", "_y", "_dx", "_dy", "_alive", "_angle")
+
+    def __init__(self):
+        """Initalizes position and velocity, as well as life."""
+        self._x = 0
+        self._y = 0
+        self._dx = 0
+        self._dy = 0
+        self._alive = True
+        self._angle = math.degrees(0)
+        
+    def advance(self):
+        """Moves the center by the velocity, wrapping around the screen's edges, straight through the slots."""
+        self._x = (self._x + self._dx) % constants.SCREEN_WIDTH
+        self._y = (self._y + self._dy) % constants.SCREEN_HEIGHT
+        
+    # Getter and setter properties are listed below
+    @property
+    def x(self):
+        return self._x
+    
+    @x.setter
+    def x(self, x):
+        self._x = x
+        
+    @property
+    def y(self):
+        return self._y
+    
+    @y.setter
+    def y(self, y):
+        self._y = y
+        
+    @property
+    def dx(self):
+        return self._dx
+    
+    @dx.setter
+    def dx(self, dx):
+        self._dx = dx
+        
+    @property
+    def dy(self):
+        return self._dy
+    
+    @dy.setter
+    def dy(self, dy):
+        self._dy = dy
+        
+    @property
+    def alive(self):
+        return self._alive
+    
+    @alive.setter
+    def alive(self, alive):
+        self._alive = alive
+        
+    @property
+    def angle(self):
+        return self._angle
+    
+    @angle.setter
+    def angle(self, angle):
+        self._angle = angle
@@ -0,0 +1,141 @@
+"""This file checks the swept hit shape tests in hitboxes against brute force: each pair's path is sampled densely,
+the shapes are turned and placed at every sample, and the answers are compared, for every pairing of the loaded shapes.
+Run it with: python hitbox_check.py --pairs 3000"""
+
+import argparse
+import sys
+import numpy as np
+import constants
+from hitboxes import load_hitbox, table, capsules_meet, narrow, shapes_meet, rotated
+from asteroid_classes import Big_Rock, Medium_Rock, Small_Rock
+from bullet import Bullet
+from ship import Ship
+
+# Points sampled along each path, counting both ends
+SAMPLES = 257
+# Distances closer than this to touching are left out, since rounding can fall either way there
+TOLERANCE = 1e-6
+
+
+def random_pairs(rng, first, second, count):
+    """Returns angles, offsets and motions for count pairs of the two shapes, ending near enough to touch.
+    Some pairs are still, some move along the second shape's axis and some at its angle of zero,
+    so the degenerate branches get as many tries as the general one."""
+    shapes = table()
+    first_angle = rng.uniform(0, 360, count)
+    second_angle = rng.uniform(0, 360, count)
+    second_angle[:count // 8] = 0
+    reach = shapes.radius[first] + shapes.radius[second]
+    distance = rng.uniform(0, 1.3, count) * reach
+    direction = rng.uniform(0, 2 * np.pi, count)
+    offset_x = distance * np.cos(direction)
+    offset_y = distance * np.sin(direction)
+    speed = rng.uniform(0, 2, count) * reach
+    heading = rng.uniform(0, 2 * np.pi, count)
+    # A quarter move along the second shape's axis, and an eighth don't move at all
+    along = rng.random(count) < 0.25
+    heading[along] = np.radians(second_angle[along]) + np.pi * rng.integers(0, 2, along.sum())
+    speed[rng.random(count) < 0.125] = 0
+    motion_x = speed * np.cos(heading)
+    motion_y = speed * np.sin(heading)
+    return first_angle, second_angle, offset_x, offset_y, motion_x, motion_y
+
+
+def sampled_paths(offset_x, offset_y, motion_x, motion_y):
+    """Returns the x and y of each pair's path at every sample, as (pairs, SAMPLES) arrays, and the step between samples."""
+    along = np.linspace(-1, 0, SAMPLES)
+    step = np.hypot(motion_x, motion_y) / (SAMPLES - 1)
+    return offset_x[:, None] + motion_x[:, None] * along, offset_y[:, None] + motion_y[:, None] * along, step
+
+
+def capsule_gaps(radius, reach, thickness, angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns how far each circle's path stayed from touching its capsule, by brute force over the samples."""
+    path_x, path_y, step = sampled_paths(offset_x, offset_y, motion_x, motion_y)
+    radians = np.radians(angle)[:, None]
+    along = np.clip(path_x * np.cos(radians) + path_y * np.sin(radians), -reach[:, None], reach[:, None])
+    gap_x = path_x - along * np.cos(radians)
+    gap_y = path_y - along * np.sin(radians)
+    return (np.sqrt(gap_x * gap_x + gap_y * gap_y) - (radius + thickness)[:, None]).min(axis=1), step
+
+
+def polygon_gaps(first, first_angle, second, second_angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns the widest separation the shapes had along any of their normals at the closest sample, by brute force;
+    negative means they overlapped. A shape moving a step along the path moves no further than that along any axis."""
+    shapes = table()
+    corners = constants.HITBOX_MAX_VERTICES
+    path_x, path_y, step = sampled_paths(offset_x, offset_y, motion_x, motion_y)
+    first_x, first_y = rotated(shapes.geometry[first], first_angle)
+    second_x, second_y = rotated(shapes.geometry[second], second_angle)
+    normal_x = np.concatenate((first_x[:, corners:], second_x[:, corners:]), axis=1)
+    normal_y = np.concatenate((first_y[:, corners:], second_y[:, corners:]), axis=1)
+    lengths = np.hypot(normal_x, normal_y)
+    normal_x = normal_x / np.where(lengths > 0, lengths, 1)
+    normal_y = normal_y / np.where(lengths > 0, lengths, 1)
+
+    # Projections of each shape's corners on every normal: (pairs, normals, corners)
+    first_projections = normal_x[:, :, None] * first_x[:, None, :corners] + normal_y[:, :, None] * first_y[:, None, :corners]
+    second_projections = (normal_x[:, :, None] * second_x[:, None, :corners]
+                          + normal_y[:, :, None] * second_y[:, None, :corners])
+    # Where the path puts the first shape along every normal: (pairs, normals, samples)
+    shift = normal_x[:, :, None] * path_x[:, None, :] + normal_y[:, :, None] * path_y[:, None, :]
+    low = first_projections.min(axis=2)[:, :, None] + shift
+    high = first_projections.max(axis=2)[:, :, None] + shift
+    separation = np.maximum(second_projections.min(axis=2)[:, :, None] - high,
+                            low - second_projections.max(axis=2)[:, :, None])
+    return separation.max(axis=1).min(axis=1), step
+
+
+def check_pairing(rng, first, second, count):
+    """Returns a list of the ways the tests disagreed with brute force for count pairs of two shape numbers."""
+    shapes = table()
+    first_angle, second_angle, offset_x, offset_y, motion_x, motion_y = random_pairs(rng, first, second, count)
+    firsts = np.full(count, first)
+    seconds = np.full(count, second)
+    failures = []
+
+    # A test may not miss a sample that touched, nor find a touch where every sample was more than half a step clear
+    def compare(name, found, gaps, step):
+        missed = (~found & (gaps < -TOLERANCE)).sum()
+        extra = (found & (gaps > step / 2 + TOLERANCE)).sum()
+        if missed or extra:
+            failures.append("{} missed {} and added {} of {} pairs".format(name, missed, extra, count))
+
+    gaps, step = capsule_gaps(shapes.radius[firsts], shapes.reach[seconds], shapes.thickness[seconds], second_angle,
+                              offset_x, offset_y, motion_x, motion_y)
+    compare("capsules_meet", capsules_meet(shapes.radius[firsts], shapes.reach[seconds], shapes.thickness[seconds],
+                                           second_angle, offset_x, offset_y, motion_x, motion_y), gaps, step)
+
+    gaps, step = polygon_gaps(firsts, first_angle, seconds, second_angle, offset_x, offset_y, motion_x, motion_y)
+    compare("shapes_meet", shapes_meet(firsts, first_angle, seconds, second_angle, offset_x, offset_y,
+                                       motion_x, motion_y), gaps, step)
+    # near must hold every overlap, and sure only overlaps
+    near, sure = narrow(firsts, seconds, second_angle, offset_x, offset_y, motion_x, motion_y)
+    missed = (~near & (gaps < -TOLERANCE)).sum()
+    extra = (sure & (gaps > step / 2 + TOLERANCE)).sum()
+    if missed or extra:
+        failures.append("narrow ruled out {} overlaps and was sure of {} misses of {} pairs".format(missed, extra, count))
+    return failures
+
+
+def main():
+    """Checks every pairing of the game's shapes, prints the results and exits with 1 if any test disagreed."""
+    parser = argparse.ArgumentParser(description="Check the swept hit shape tests against brute force.")
+    parser.add_argument("--pairs", type=int, default=3000, help="random pairs to check for each pairing of shapes")
+    parser.add_argument("--seed", type=int, default=1)
+    options = parser.parse_args()
+
+    rng = np.random.default_rng(options.seed)
+    names = {}
+    for object_class in (Ship, Bullet, Big_Rock, Medium_Rock, Small_Rock):
+        names[load_hitbox(object_class.texture_path).index] = object_class.__name__
+    failed = False
+    for first in sorted(names):
+        for second in sorted(names):
+            failures = check_pairing(rng, first, second, options.pairs)
+            failed = failed or bool(failures)
+            print("{:<12} {:<12} {}".format(names[first], names[second], "; ".join(failures) or "agrees"))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
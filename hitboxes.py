@@ -0,0 +1,322 @@
+"""This file keeps the hit shape of every image objects are drawn with: a convex polygon traced from the image's
+alpha channel, so collisions match what is on the screen rather than a hand-set radius.
+Shapes are traced once per image and kept in HITBOX_CACHE beside this file, keyed by resource path, so a World never
+decodes an image or imports arcade; delete that file and run once to trace them again if an image changes.
+Each loaded shape is numbered, and every shape's arrays are stacked into one table, so store rows only keep a shape number
+and pairs of rows gather their shapes without a Python loop."""
+
+import json
+import os
+import threading
+from collections import namedtuple
+import numpy as np
+import constants
+from spatial_hash import circles_meet
+
+# A convex polygon centred on the image's middle, y up like the screen. geometry holds HITBOX_MAX_VERTICES corners
+# followed by the outward normal of each edge (from each corner to the next), extents the lowest and highest the corners
+# reach along each normal, radius that of the smallest circle about the centre that holds the polygon,
+# inner_radius that of the largest one the polygon holds, and index the shape's number in the table.
+# reach and thickness describe a capsule holding the polygon, reach either way along its x axis and thickness around that,
+# which fits long thin shapes like lasers far tighter than the circle does
+Hitbox = namedtuple("Hitbox", ["geometry", "extents", "radius", "inner_radius", "index", "reach", "thickness"])
+
+# Every shape loaded so far, keyed by resource path, and in the order they were numbered
+_hitboxes = {}
+_numbered = []
+# Every numbered shape's arrays stacked together; rebuilt when a shape is added
+_table = None
+# Held while shapes are loaded or the cache file is written, so threads never trace the same image twice
+_lock = threading.Lock()
+
+
+def load_hitbox(img):
+    """Returns the shared hit shape for an image, reading it from the disk cache or tracing it from the image
+    only the first time it is asked for."""
+    hitbox = _hitboxes.get(img)
+    if hitbox is None:
+        with _lock:
+            hitbox = _hitboxes.get(img)
+            if hitbox is None:
+                hitbox = _load(img, len(_numbered))
+                _hitboxes[img] = hitbox
+                _numbered.append(hitbox)
+    return hitbox
+
+
+def table():
+    """Returns one hit shape whose arrays hold every loaded shape, indexed by shape number."""
+    global _table
+    if _table is None or len(_table.index) != len(_numbered):
+        with _lock:
+            _table = Hitbox(*(np.array(field) for field in zip(*_numbered)))
+    return _table
+
+
+def cache_path():
+    """Returns where the traced shapes are kept, beside this file whatever the working directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), constants.HITBOX_CACHE)
+
+
+def _load(img, index):
+    """Returns an image's hit shape, numbered index, from the shapes file, tracing it and adding it to the file
+    when it is missing. The image is only opened, and arcade only imported, when the shape has to be traced."""
+    cache = read_cache(cache_path())
+    vertices = cache.get(img)
+    if vertices is None:
+        from PIL import Image
+        from arcade.resources import resolve_resource_path
+
+        with Image.open(resolve_resource_path(img)) as image:
+            vertices = trace_hull(image).tolist()
+        cache[img] = vertices
+        write_cache(cache_path(), cache)
+    return make_hitbox(np.array(vertices, dtype=float).reshape(-1, 2), index)
+
+
+def read_cache(path):
+    """Returns the cached corners of each shape keyed by resource path, or nothing if the file is missing, unreadable,
+    or was traced with different settings."""
+    try:
+        with open(path) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("settings") != cache_settings():
+        return {}
+    return cache.get("hitboxes", {})
+
+
+def write_cache(path, hitboxes):
+    """Saves every shape to the cache file. The file is swapped in whole, so a run reading it at the same time
+    sees either the old shapes or the new ones; a cache that can't be written is skipped."""
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(temporary, "w") as cache_file:
+            json.dump({"settings": cache_settings(), "hitboxes": hitboxes}, cache_file, indent=1, sort_keys=True)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def cache_settings():
+    """Returns the settings shapes are traced with, so a cache traced with other settings is not used."""
+    return {"alpha_threshold": constants.HITBOX_ALPHA_THRESHOLD, "max_vertices": constants.HITBOX_MAX_VERTICES}
+
+
+def trace_hull(image):
+    """Returns the corners of the convex hull of an image's solid pixels, counter-clockwise, centred on the image
+    and with y up, simplified to at most HITBOX_MAX_VERTICES corners."""
+    alpha = np.asarray(image.convert("RGBA"))[:, :, 3]
+    height, width = alpha.shape
+    solid = alpha > constants.HITBOX_ALPHA_THRESHOLD
+    rows = np.flatnonzero(solid.any(axis=1))
+    if not len(rows):
+        return np.zeros((0, 2))
+
+    # Only the first and last solid pixel of each row can be on the hull; each adds its outer corners
+    left = solid[rows].argmax(axis=1)
+    right = width - 1 - solid[rows, ::-1].argmax(axis=1)
+    points = set()
+    for row, first, last in zip(rows.tolist(), left.tolist(), right.tolist()):
+        for x in (first, last + 1):
+            points.add((x - width / 2, height / 2 - row))
+            points.add((x - width / 2, height / 2 - row - 1))
+    return simplify(convex_hull(sorted(points)), constants.HITBOX_MAX_VERTICES)
+
+
+def convex_hull(points):
+    """Returns the convex hull of a sorted list of (x, y) points, counter-clockwise, using the monotone chain method."""
+    def half(points):
+        chain = []
+        for point in points:
+            while len(chain) >= 2 and cross(chain[-2], chain[-1], point) <= 0:
+                chain.pop()
+            chain.append(point)
+        return chain[:-1]
+    return half(points) + half(points[::-1])
+
+
+def cross(origin, first, second):
+    """Returns the z component of the cross product of two points taken from an origin; positive when they turn left."""
+    return (first[0] - origin[0]) * (second[1] - origin[1]) - (first[1] - origin[1]) * (second[0] - origin[0])
+
+
+def simplify(hull, max_vertices):
+    """Returns a hull with the corners that cover the least area dropped one at a time until at most max_vertices are left.
+    Dropping a corner of a convex hull keeps it convex, and loses only a sliver along the edge."""
+    hull = list(hull)
+    while len(hull) > max(max_vertices, 3):
+        areas = [cross(hull[number - 1], hull[number], hull[(number + 1) % len(hull)]) for number in range(len(hull))]
+        del hull[areas.index(min(areas))]
+    return np.array(hull, dtype=float).reshape(-1, 2)
+
+
+def make_hitbox(vertices, index=0):
+    """Returns hit shape number index for a counter-clockwise polygon, with its edge normals, its extent along each of them
+    and its outer and inner radii worked out up front.
+    Every shape is padded to HITBOX_MAX_VERTICES corners, repeating its last corner and first normal,
+    so shapes of any size stack into one array and are tested together."""
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    normals = np.column_stack((edges[:, 1], -edges[:, 0]))
+    radius = float(np.sqrt((vertices ** 2).sum(axis=1)).max()) if len(vertices) else 0.0
+    reach, thickness = fit_capsule(vertices)
+    padding = constants.HITBOX_MAX_VERTICES - len(vertices)
+    if len(vertices) and padding > 0:
+        vertices = np.concatenate((vertices, np.repeat(vertices[-1:], padding, axis=0)))
+        normals = np.concatenate((normals, np.repeat(normals[:1], padding, axis=0)))
+    elif not len(vertices):
+        # An image with no solid pixels gets a shape that never meets anything
+        vertices = normals = np.zeros((constants.HITBOX_MAX_VERTICES, 2))
+    # A shape's extent along its own normals is the same however it is turned, so it is never projected again
+    projections = normals @ vertices.T
+    extents = np.column_stack((projections.min(axis=1), projections.max(axis=1)))
+    # The nearest edge to the centre bounds the largest circle about the centre inside the shape
+    lengths = np.sqrt((normals ** 2).sum(axis=1))
+    inner_radius = max(float((extents[:, 1] / np.where(lengths > 0, lengths, np.inf)).min()), 0.0)
+    # Corners then normals, so both are turned in one pass
+    return Hitbox(np.concatenate((vertices, normals)), extents, radius, inner_radius, index, reach, thickness)
+
+
+def fit_capsule(vertices, steps=32):
+    """Returns the reach and thickness of the capsule along the x axis with the least area that holds a polygon.
+    The corner furthest from a segment is always the furthest point of the polygon, so only corners are measured."""
+    if not len(vertices):
+        return 0.0, 0.0
+    best = None
+    for reach in np.linspace(0, np.abs(vertices[:, 0]).max(), steps + 1):
+        thickness = np.sqrt(np.maximum(np.abs(vertices[:, 0]) - reach, 0) ** 2 + vertices[:, 1] ** 2).max()
+        area = 4 * reach * thickness + np.pi * thickness ** 2
+        if best is None or area < best[0]:
+            best = (area, float(reach), float(thickness))
+    return best[1], best[2]
+
+
+def shapes_meet(first_shapes, first_angle, second_shapes, second_angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns whether each pair of hit shapes, named by shape numbers, overlapped at any point during their last move.
+    Only the pairs narrow can't settle get the exact test. Arguments are arrays with one value per pair,
+    as for polygons_meet."""
+    near, meet = narrow(first_shapes, second_shapes, second_angle, offset_x, offset_y, motion_x, motion_y)
+    exact = np.flatnonzero(near & ~meet)
+    if len(exact):
+        meet[exact] = exact_meet(first_shapes[exact], first_angle[exact], second_shapes[exact], second_angle[exact],
+                                 offset_x[exact], offset_y[exact], motion_x[exact], motion_y[exact])
+    return meet
+
+
+def narrow(first_shapes, second_shapes, second_angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns which pairs of hit shapes might have met, and which surely met, without the exact test.
+    Pairs are expected to have passed the circle check on their outer radii already. They might have met if
+    the first shape's swept circle reached the second's capsule, and surely met if their inner circles did."""
+    shapes = table()
+    near = capsules_meet(shapes.radius[first_shapes], shapes.reach[second_shapes], shapes.thickness[second_shapes],
+                         second_angle, offset_x, offset_y, motion_x, motion_y)
+    sure = near & circles_meet(offset_x, offset_y, motion_x, motion_y,
+                               shapes.inner_radius[first_shapes] + shapes.inner_radius[second_shapes])
+    return near, sure
+
+
+def exact_meet(first_shapes, first_angle, second_shapes, second_angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns whether each pair of hit shapes, named by shape numbers, overlapped, by gathering their geometry
+    from the table for polygons_meet."""
+    shapes = table()
+    return polygons_meet(gather(shapes, first_shapes), first_angle, gather(shapes, second_shapes), second_angle,
+                         offset_x, offset_y, motion_x, motion_y)
+
+
+def capsules_meet(radius, reach, thickness, angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns whether circles of the given radii, swept along their last move, came within each capsule's thickness
+    of its segment, turned by angle in degrees. Offsets and motions are those of the circles relative to the capsules.
+    The closest points of the circle's path and the capsule's segment are found by clamping, element-wise."""
+    radians = np.radians(angle)
+    # The path runs from start to the offset, and the segment from -axis to +axis
+    start_x = offset_x - motion_x
+    start_y = offset_y - motion_y
+    axis_x = np.cos(radians) * reach
+    axis_y = np.sin(radians) * reach
+    segment_x = 2 * axis_x
+    segment_y = 2 * axis_y
+    between_x = start_x + axis_x
+    between_y = start_y + axis_y
+
+    path_length = motion_x * motion_x + motion_y * motion_y
+    segment_length = segment_x * segment_x + segment_y * segment_y
+    along_path = motion_x * between_x + motion_y * between_y
+    along_segment = segment_x * between_x + segment_y * between_y
+    shared = motion_x * segment_x + motion_y * segment_y
+    safe_path = np.where(path_length > 0, path_length, 1)
+    safe_segment = np.where(segment_length > 0, segment_length, 1)
+    denominator = path_length * segment_length - shared * shared
+
+    # A capsule with no length is a circle, so the path's closest point is to the capsule's centre
+    path = np.where(denominator > 0, np.clip((shared * along_segment - along_path * segment_length)
+                                             / np.where(denominator > 0, denominator, 1), 0, 1),
+                    np.where(segment_length > 0, 0, np.clip(-along_path / safe_path, 0, 1)))
+    segment = np.where(segment_length > 0, (shared * path + along_segment) / safe_segment, 0)
+    path = np.where(segment < 0, np.clip(-along_path / safe_path, 0, 1),
+                    np.where(segment > 1, np.clip((shared - along_path) / safe_path, 0, 1), path))
+    path = np.where(path_length > 0, path, 0)
+    segment = np.clip(segment, 0, 1)
+
+    gap_x = start_x + motion_x * path + axis_x - segment_x * segment
+    gap_y = start_y + motion_y * path + axis_y - segment_y * segment
+    reach_sum = radius + thickness
+    return gap_x * gap_x + gap_y * gap_y < reach_sum * reach_sum
+
+
+def gather(shapes, numbers):
+    """Returns one hit shape whose arrays hold the table's shape of each given number in turn."""
+    return Hitbox(shapes.geometry[numbers], shapes.extents[numbers], shapes.radius[numbers],
+                  shapes.inner_radius[numbers], numbers, shapes.reach[numbers], shapes.thickness[numbers])
+
+
+def rotated(geometry, angle):
+    """Returns the x and y arrays of shapes' corners and normals turned counter-clockwise by angles in degrees,
+    as they are drawn. geometry has a shape's rows for each angle."""
+    radians = np.radians(angle)[:, None]
+    cosine = np.cos(radians)
+    sine = np.sin(radians)
+    x = geometry[..., 0]
+    y = geometry[..., 1]
+    return x * cosine - y * sine, x * sine + y * cosine
+
+
+def polygons_meet(first, first_angle, second, second_angle, offset_x, offset_y, motion_x, motion_y):
+    """Returns whether each pair of hit shapes overlapped at any point during their last move, by the separating axis test.
+    first and second are shapes gathered from the table with one shape per pair;
+    angles, offsets and motions have one value per pair.
+    offset is where the first shape's centre ended up relative to the second, and motion is how far it moved relative
+    to the second; the first shape is swept along that path, so fast objects can't pass through each other between frames.
+    Shapes are tested at the angles they ended the move at."""
+    corners = constants.HITBOX_MAX_VERTICES
+    first_x, first_y = rotated(first.geometry, first_angle)
+    second_x, second_y = rotated(second.geometry, second_angle)
+    first_normal_x = first_x[:, corners:]
+    first_normal_y = first_y[:, corners:]
+    second_normal_x = second_x[:, corners:]
+    second_normal_y = second_y[:, corners:]
+    first_x = first_x[:, :corners] + offset_x[:, None]
+    first_y = first_y[:, :corners] + offset_y[:, None]
+    second_x = second_x[:, :corners]
+    second_y = second_y[:, :corners]
+
+    # Along the first shape's normals: its own extent moved by the offset, against the second shape's corners
+    shift = first_normal_x * offset_x[:, None] + first_normal_y * offset_y[:, None]
+    projections = first_normal_x[:, :, None] * second_x[:, None, :] + first_normal_y[:, :, None] * second_y[:, None, :]
+    back = -(first_normal_x * motion_x[:, None] + first_normal_y * motion_y[:, None])
+    meet = np.all((first.extents[..., 0] + shift + np.minimum(back, 0) < projections.max(axis=2))
+                  & (first.extents[..., 1] + shift + np.maximum(back, 0) > projections.min(axis=2)), axis=1)
+
+    # Along the second shape's normals: the first shape's corners against the second's own extent
+    projections = second_normal_x[:, :, None] * first_x[:, None, :] + second_normal_y[:, :, None] * first_y[:, None, :]
+    back = -(second_normal_x * motion_x[:, None] + second_normal_y * motion_y[:, None])
+    meet &= np.all((projections.min(axis=2) + np.minimum(back, 0) < second.extents[..., 1])
+                   & (projections.max(axis=2) + np.maximum(back, 0) > second.extents[..., 0]), axis=1)
+
+    # The swept shape has two more edges along the path, so the path's normal is tested too when there was a move
+    first_projections = first_x * -motion_y[:, None] + first_y * motion_x[:, None]
+    second_projections = second_x * -motion_y[:, None] + second_y * motion_x[:, None]
+    moving = (motion_x != 0) | (motion_y != 0)
+    meet &= ~moving | ((first_projections.min(axis=1) < second_projections.max(axis=1))
+                       & (first_projections.max(axis=1) > second_projections.min(axis=1)))
+    return meet
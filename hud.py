@@ -0,0 +1,80 @@
+"""This file is for the Hud class, which keeps the lives and score shown at the top of the screen.
+Its sprites and text are built once and only changed when the value they show changes,
+so a frame where nothing changed costs a couple of draw calls and no layout."""
+
+import arcade
+import constants
+import textures
+from renderer import Sprite_Batch
+from ship_lives_display import Ship_Lives
+
+
+class Hud:
+    """A class that shows a row of little ships and a score for each player in a World.
+    Each player's last shown lives and score are kept, and work is only done for the ones that changed."""
+    def __init__(self, players):
+        """Accepts the number of players, and lays out a score for each, stacked down the top right corner."""
+        self._rows = [[] for player in range(players)]
+        # Lives and score each player was last shown with; None until first synced
+        self._shown_lives = [None] * players
+        self._shown_scores = [None] * players
+        # Built once the little ship's image is loaded
+        self._lives_batch = None
+        self._lives_dirty = False
+
+        prefix = "Score" if players == 1 else "P{} "
+        self._score_formats = [prefix.format(number + 1) + " {}" for number in range(players)]
+        self._score_texts = [arcade.Text("", constants.SCREEN_WIDTH - 20, constants.SCREEN_HEIGHT - 30 - 20 * number,
+                                         arcade.color.WHITE, 14, anchor_x="right", anchor_y="center")
+                             for number in range(players)]
+
+    def sync(self, world):
+        """Brings the display up to date with a world's players, rebuilding only what changed.
+        The little ship's image must be loaded before the first sync."""
+        for number, player in enumerate(world.players):
+            lives = max(player.ship.lives, 0)
+            if lives != self._shown_lives[number]:
+                self.sync_row(number, lives)
+                self._shown_lives[number] = lives
+                self._lives_dirty = True
+
+            score = player.score
+            if score != self._shown_scores[number]:
+                self._score_texts[number].text = self._score_formats[number].format(score)
+                self._shown_scores[number] = score
+
+        if self._lives_dirty:
+            if self._lives_batch is None:
+                self._lives_batch = Sprite_Batch(textures.load_texture(Ship_Lives.texture_path))
+            self._lives_batch.sync([life for row in self._rows for life in row])
+            self._lives_dirty = False
+
+    def sync_row(self, number, lives):
+        """Adds or removes Ship_Lives objects so a player's row has one per life.
+        Rows are stacked down from the top of the screen, in player order."""
+        row = self._rows[number]
+        if len(row) > lives:
+            del row[lives:]
+        elif len(row) < lives:
+            row[:] = [Ship_Lives() for life in range(lives)]
+            # Count variable and for loop adjusts position of lives so they are spaced out
+            count = 0
+            for life in row:
+                life.center.x += (life.texture[0]) * count
+                life.center.y -= (life.texture[1]) * number
+                count += 1
+
+    def draw(self):
+        """Draws the lives in one batch and then the scores, and returns how many draw calls were made."""
+        calls = 0
+        if self._lives_batch:
+            calls += self._lives_batch.draw()
+        for text in self._score_texts:
+            text.draw()
+            calls += 1
+        return calls
+
+    # Getter properties are listed below
+    @property
+    def rows(self):
+        return self._rows
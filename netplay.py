@@ -0,0 +1,426 @@
+"""This file runs one World in lock-step across several processes, for multiplayer over local UDP sockets.
+Only inputs cross the wire: every peer simulates the whole world itself, so bandwidth stays the same however many
+rocks there are. Inputs that haven't arrived yet are predicted, and when a prediction turns out wrong the world is
+rolled back to a snapshot and played forward again with the real inputs.
+Run a headless test with: python netplay.py --players 3 --ticks 1200 --latency-ms 40
+or join a windowed game as one player with: python netplay.py --players 2 --player 0 --window"""
+
+import argparse
+import heapq
+import multiprocessing
+import socket
+import struct
+import time
+from collections import deque
+import numpy as np
+import constants
+from world import World
+
+MAGIC = b"ASTN"
+# Magic, sending player, newest tick of the recipient's inputs the sender has every tick up to,
+# first tick of the inputs carried, how many there are, the sender's clock when sending,
+# and the newest clock time received from the recipient along with how long ago it arrived, for round-trip times
+PACKET = struct.Struct("<4sBiIBddd")
+# Held and pressed INPUT_* flags of one tick
+INPUT = struct.Struct("<BB")
+# Most ticks of inputs one packet carries
+MOST_INPUTS = 255
+
+# Each player's socket listens on BASE_PORT plus their number
+BASE_PORT = 47800
+# Ticks between reading a player's input and acting on it; gives inputs time to arrive before they are needed
+INPUT_DELAY = 2
+# Furthest the world runs ahead of the oldest input still missing; past it, the session waits
+MAX_ROLLBACK = 8
+# Seconds between sending inputs again while waiting on a peer
+RESEND_INTERVAL = 1 / constants.SIMULATION_RATE
+# Seconds a finished peer keeps resending its last inputs for peers that haven't received them
+LINGER = 2.0
+
+
+class Udp_Transport:
+    """A class that sends and receives datagrams between the players, on one localhost port each.
+    An artificial latency can be added, to see rollback at work on a single machine."""
+    def __init__(self, player, players, port=BASE_PORT, host="127.0.0.1", latency=0.0):
+        """Accepts this player's number, how many players there are, the base port and host,
+        and the seconds every outgoing datagram is held back for."""
+        self._addresses = [(host, port + number) for number in range(players)]
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(self._addresses[player])
+        self._socket.setblocking(False)
+        self._latency = latency
+        # Datagrams waiting out the latency, as (due time, order sent, peer, data)
+        self._outgoing = []
+        self._sent = 0
+
+    def send(self, peer, data):
+        """Sends a datagram to a peer, now or once the latency has passed."""
+        if self._latency:
+            heapq.heappush(self._outgoing, (time.perf_counter() + self._latency, self._sent, peer, data))
+            self._sent += 1
+            self.flush()
+        else:
+            self._send_now(peer, data)
+
+    def flush(self):
+        """Sends every held back datagram whose latency has passed."""
+        now = time.perf_counter()
+        while self._outgoing and self._outgoing[0][0] <= now:
+            due, order, peer, data = heapq.heappop(self._outgoing)
+            self._send_now(peer, data)
+
+    def _send_now(self, peer, data):
+        """Sends a datagram, ignoring a peer that isn't listening yet; lost inputs are sent again anyway."""
+        try:
+            self._socket.sendto(data, self._addresses[peer])
+        except OSError:
+            pass
+
+    def receive(self):
+        """Returns every datagram that has arrived since the last call."""
+        self.flush()
+        received = []
+        while True:
+            try:
+                received.append(self._socket.recv(65536))
+            except BlockingIOError:
+                return received
+            except OSError:
+                # A refused earlier datagram is reported here on some systems
+                continue
+
+    def close(self):
+        """Closes the socket."""
+        self._socket.close()
+
+
+class Net_Stats:
+    """A class that counts the traffic and rollbacks of a session, and keeps recent round-trip times."""
+    def __init__(self, window=600):
+        """Accepts how many round-trip times to keep."""
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+        # Times the world was rolled back, and ticks simulated again because of it
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+        # Steps that waited because an input was further behind than MAX_ROLLBACK
+        self.stalls = 0
+        self._round_trips = deque(maxlen=window)
+
+    def add_round_trip(self, seconds):
+        """Records one round-trip time."""
+        self._round_trips.append(seconds)
+
+    def summary(self, seconds, ticks):
+        """Returns the stats as a dictionary, with bandwidth over the given seconds and round-trip times in ms."""
+        summary = {
+            "ticks": ticks,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "packets_sent": self.packets_sent,
+            "packets_received": self.packets_received,
+            "sent_bytes_per_second": self.bytes_sent / seconds if seconds else 0,
+            "received_bytes_per_second": self.bytes_received / seconds if seconds else 0,
+            "sent_bytes_per_tick": self.bytes_sent / ticks if ticks else 0,
+            "rollbacks": self.rollbacks,
+            "resimulated_ticks": self.resimulated_ticks,
+            "stalls": self.stalls,
+        }
+        if self._round_trips:
+            millis = np.array(self._round_trips) * 1000
+            summary["rtt_ms"] = {"mean": float(millis.mean()), "p50": float(np.percentile(millis, 50)),
+                                 "p95": float(np.percentile(millis, 95)), "max": float(millis.max())}
+        return summary
+
+
+class Lockstep_Session:
+    """A class that steps a World in lock-step with the other players' sessions, trading only inputs.
+    Each step reads the local player's input for a tick INPUT_DELAY ticks ahead, sends it to every peer,
+    and runs the world one tick using the inputs it has; missing ones are predicted to repeat the player's last
+    held inputs. A snapshot is kept of every tick that used a prediction, so a wrong one can be rolled back."""
+    def __init__(self, world, player, transport, input_delay=INPUT_DELAY, max_rollback=MAX_ROLLBACK):
+        """Accepts a world with a Player for every peer, built the same way on every peer,
+        this peer's player number, and a transport connecting the peers."""
+        self._world = world
+        self._player = player
+        self._players = len(world.players)
+        self._transport = transport
+        self._input_delay = input_delay
+        self._max_rollback = max_rollback
+        self._stats = Net_Stats()
+
+        # Inputs known for each player, by tick; nobody has any input before the delay runs out
+        self._inputs = [{tick: (0, 0) for tick in range(world.tick, world.tick + input_delay)}
+                        for number in range(self._players)]
+        # Newest tick each player's inputs are known up to, with none missing before it
+        self._confirmed = [world.tick + input_delay - 1] * self._players
+        # Newest tick of this player's inputs each peer has acknowledged
+        self._acknowledged = [world.tick + input_delay - 1] * self._players
+        # The world's state before each unconfirmed tick, and the inputs that tick was run with
+        self._snapshots = {}
+        self._used = {}
+        # Earliest tick run with a wrong prediction, found when the real input arrives
+        self._rollback_tick = None
+        # Newest clock time received from each peer, and when it arrived, for echoing back
+        self._echoes = [(0.0, 0.0)] * self._players
+        self._last_send = 0.0
+
+    def step(self, held=0, pressed=0):
+        """Reads this player's inputs, trades inputs with the peers, and runs the world one tick.
+        Returns false without running a tick if a peer has fallen too far behind; the caller should keep
+        any pressed inputs and try again."""
+        self.poll()
+        world = self._world
+        if world.tick - min(self._confirmed) > self._max_rollback:
+            self._stats.stalls += 1
+            # Sends again now and then, in case the peer is waiting on inputs that were lost
+            if time.perf_counter() - self._last_send >= RESEND_INTERVAL:
+                self.send()
+            return False
+
+        tick = world.tick + self._input_delay
+        self._inputs[self._player][tick] = (held, pressed)
+        self._confirmed[self._player] = tick
+        self._acknowledged[self._player] = tick
+        self.send()
+        self.run_tick()
+        self.forget()
+        return True
+
+    def run_tick(self):
+        """Runs the world one tick with the best inputs known, keeping a snapshot if any of them were predicted."""
+        world = self._world
+        tick = world.tick
+        inputs = [self.input_for(number, tick) for number in range(self._players)]
+        if tick > min(self._confirmed):
+            self._snapshots[tick] = world.snapshot()
+            self._used[tick] = inputs
+        world.step_players(inputs)
+
+    def input_for(self, number, tick):
+        """Returns a player's input for a tick, predicting it from their newest known input if it hasn't arrived.
+        Held inputs are predicted to stay held; presses are predicted not to happen."""
+        known = self._inputs[number].get(tick)
+        if known is not None:
+            return known
+        held, pressed = self._inputs[number][self._confirmed[number]]
+        return held, 0
+
+    def poll(self):
+        """Takes in every packet that has arrived, then rolls back and plays forward again if a prediction was wrong."""
+        for data in self._transport.receive():
+            self.receive(data)
+        if self._rollback_tick is not None:
+            self.rollback(self._rollback_tick)
+            self._rollback_tick = None
+
+    def receive(self, data):
+        """Records the inputs in one packet, noting the earliest tick that was run with a wrong prediction."""
+        if len(data) < PACKET.size:
+            return
+        magic, number, acknowledged, first_tick, count, sent, echo, echo_age = PACKET.unpack_from(data)
+        if magic != MAGIC or number == self._player or number >= self._players:
+            return
+        stats = self._stats
+        stats.bytes_received += len(data)
+        stats.packets_received += 1
+
+        now = time.perf_counter()
+        if echo:
+            stats.add_round_trip(now - echo - echo_age)
+        if sent > self._echoes[number][0]:
+            self._echoes[number] = (sent, now)
+        self._acknowledged[number] = max(self._acknowledged[number], acknowledged)
+
+        known = self._inputs[number]
+        for tick, held_pressed in enumerate(INPUT.iter_unpack(data[PACKET.size:PACKET.size + count * INPUT.size]),
+                                            first_tick):
+            if tick in known or tick <= self._confirmed[number]:
+                continue
+            known[tick] = held_pressed
+            used = self._used.get(tick)
+            if used is not None and used[number] != held_pressed:
+                if self._rollback_tick is None or tick < self._rollback_tick:
+                    self._rollback_tick = tick
+        # Moves the confirmed tick past every input that has now arrived
+        confirmed = self._confirmed[number]
+        while confirmed + 1 in known:
+            confirmed += 1
+        self._confirmed[number] = confirmed
+
+    def rollback(self, tick):
+        """Puts the world back to before a tick, then runs it forward again to where it was with the inputs now known."""
+        world = self._world
+        target = world.tick
+        world.restore(self._snapshots[tick])
+        self._stats.rollbacks += 1
+        self._stats.resimulated_ticks += target - tick
+        while world.tick < target:
+            self.run_tick()
+
+    def send(self):
+        """Sends every peer this player's inputs from the first tick it hasn't acknowledged."""
+        known = self._inputs[self._player]
+        newest = self._confirmed[self._player]
+        now = time.perf_counter()
+        self._last_send = now
+        for number in range(self._players):
+            if number == self._player:
+                continue
+            first_tick = max(self._acknowledged[number] + 1, newest - MOST_INPUTS + 1)
+            inputs = [INPUT.pack(*known[tick]) for tick in range(first_tick, newest + 1)]
+            echo, received = self._echoes[number]
+            data = PACKET.pack(MAGIC, self._player, self._confirmed[number], first_tick, len(inputs), now, echo,
+                               now - received if echo else 0.0) + b"".join(inputs)
+            self._transport.send(number, data)
+            self._stats.bytes_sent += len(data)
+            self._stats.packets_sent += 1
+
+    def forget(self):
+        """Drops snapshots and inputs of ticks every player's inputs have arrived for, since they can't be rolled back."""
+        settled = min(self._confirmed)
+        for tick in [tick for tick in self._snapshots if tick <= settled]:
+            del self._snapshots[tick]
+            del self._used[tick]
+        # Keeps each player's newest settled input, for predicting from,
+        # and this player's inputs that a peer hasn't acknowledged, for sending again
+        oldest = min(settled, self._world.tick) - 1
+        for number, known in enumerate(self._inputs):
+            if number == self._player:
+                keep_from = min(oldest, min(self._acknowledged) + 1)
+            else:
+                keep_from = oldest
+            for tick in [tick for tick in known if tick < keep_from]:
+                del known[tick]
+
+    def finish(self, timeout=LINGER):
+        """Keeps trading inputs, rolling back if needed, until every input of the ticks run so far has arrived
+        and every peer has acknowledged this player's, or the timeout runs out.
+        Returns whether every input arrived, so the world's state is final."""
+        last_tick = self._world.tick - 1
+        end = time.perf_counter() + timeout
+        while time.perf_counter() < end:
+            self.poll()
+            self.send()
+            if min(self._confirmed) >= last_tick and min(self._acknowledged) >= last_tick:
+                break
+            time.sleep(0.005)
+        return min(self._confirmed) >= last_tick
+
+    # Getter properties are listed below
+    @property
+    def world(self):
+        return self._world
+
+    @property
+    def player(self):
+        return self._player
+
+    @property
+    def stats(self):
+        return self._stats
+
+
+def run_peer(player, players, ticks, seed, port=BASE_PORT, latency=0.0, rate=constants.SIMULATION_RATE):
+    """Plays one headless peer of a local game with a random policy, and returns its checksum and stats.
+    :param rate: ticks per second to aim for, as a real game would run; 0 runs as fast as the peers allow
+    """
+    from batch_runner import Random_Policy
+
+    # Enough lives that every ship keeps respawning for the whole test
+    world = World(seed, players=players)
+    for other in world.players:
+        other.ship.lives = 10 ** 9
+    transport = Udp_Transport(player, players, port, latency=latency)
+    session = Lockstep_Session(world, player, transport)
+    policy = Random_Policy(seed * players + player)
+
+    start = time.perf_counter()
+    next_tick = start
+    inputs = None
+    while world.tick < ticks:
+        if inputs is None:
+            inputs = policy(world)
+        if session.step(*inputs):
+            inputs = None
+        elif not rate:
+            time.sleep(0.0005)
+        if rate:
+            next_tick += 1 / rate
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    elapsed = time.perf_counter() - start
+    settled = session.finish()
+    transport.close()
+
+    return {
+        "player": player,
+        "checksum": world.checksum().hex(),
+        "settled": settled,
+        "scores": [other.score for other in world.players],
+        "seconds": elapsed,
+        "stats": session.stats.summary(elapsed, world.tick),
+    }
+
+
+def run_local(players, ticks, seed, port=BASE_PORT, latency=0.0, rate=constants.SIMULATION_RATE):
+    """Runs every peer of a headless game in its own process on this machine, and returns their results in order."""
+    arguments = [(player, players, ticks, seed, port, latency, rate) for player in range(players)]
+    with multiprocessing.Pool(players) as pool:
+        return pool.starmap(run_peer, arguments, 1)
+
+
+def run_window(player, players, seed, port=BASE_PORT, latency=0.0):
+    """Opens a game window for one player of a networked game; the other players join from their own processes."""
+    import arcade
+    from asteroids import Game
+
+    world = World(seed, players=players)
+    transport = Udp_Transport(player, players, port, latency=latency)
+    session = Lockstep_Session(world, player, transport)
+    start = time.perf_counter()
+    Game(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT, session=session)
+    arcade.run()
+    transport.close()
+    elapsed = time.perf_counter() - start
+    print(session.stats.summary(elapsed, world.tick))
+
+
+def main():
+    """Runs a headless local test of lock-step play, or joins a windowed game, from the command line."""
+    parser = argparse.ArgumentParser(description="Play asteroids in lock-step between processes on this machine.")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--player", type=int, help="with --window, which player this process is")
+    parser.add_argument("--window", action="store_true", help="open a game window for --player")
+    parser.add_argument("--ticks", type=int, default=constants.SIMULATION_RATE * 20, help="ticks for a headless test")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=BASE_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0, help="extra delay added to every packet")
+    parser.add_argument("--rate", type=float, default=constants.SIMULATION_RATE,
+                        help="ticks per second for a headless test; 0 runs as fast as possible")
+    options = parser.parse_args()
+    latency = options.latency_ms / 1000
+
+    if options.window:
+        run_window(options.player or 0, options.players, options.seed, options.port, latency)
+        return
+
+    results = run_local(options.players, options.ticks, options.seed, options.port, latency, options.rate)
+    checksums = {result["checksum"] for result in results}
+    print("{} players, {} ticks: checksums {}".format(
+        options.players, options.ticks, "match" if len(checksums) == 1 else "DIFFER"))
+    for result in results:
+        stats = result["stats"]
+        rtt = stats.get("rtt_ms", {})
+        print("player {}  {:>6.0f} B/s out  {:>5.1f} B/tick  rtt p50 {:>5.1f}ms p95 {:>5.1f}ms  "
+              "rollbacks {:>4} ({} ticks)  stalls {:>4}  {}".format(
+                  result["player"], stats["sent_bytes_per_second"], stats["sent_bytes_per_tick"],
+                  rtt.get("p50", 0), rtt.get("p95", 0), stats["rollbacks"], stats["resimulated_ticks"],
+                  stats["stalls"], "settled" if result["settled"] else "UNSETTLED"))
+
+
+if __name__ == "__main__":
+    main()
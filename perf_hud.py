@@ -0,0 +1,57 @@
+"""This file contains a class that draws a Frame_Profiler's numbers as an overlay beside the lives display."""
+
+import arcade
+import constants
+
+
+class Perf_Hud:
+    """This class is responsible for showing phase timings, entity counts and draw calls on the screen.
+    Its text is only laid out again every few frames, rather than on every frame it is drawn."""
+    def __init__(self, profiler, refresh=constants.PERF_HUD_REFRESH):
+        """Accepts the profiler to display, and places the overlay to the right of the little ships.
+        :param refresh: frames between refreshes of the overlay's text
+        """
+        self._profiler = profiler
+        self._x = 30 + constants.SHIP_LIVES * 40
+        self._y = constants.SCREEN_HEIGHT - 20
+        self._refresh = refresh
+        # Frames left until the text is refreshed; the first frame always refreshes
+        self._countdown = 0
+        # One text object per line, kept and reused as long as the overlay is shown
+        self._texts = []
+
+    def lines(self):
+        """Returns the overlay's text, one line per phase followed by the counters."""
+        lines = []
+        for phase in self._profiler.phases:
+            summary = self._profiler.summary(phase)
+            lines.append("{:<16} p50 {:>7.0f}us  p95 {:>7.0f}us  max {:>7.0f}us".format(
+                phase, summary["p50"], summary["p95"], summary["max"]))
+        counts = self._profiler.counts
+        lines.append("  ".join("{} {}".format(name, value) for name, value in counts.items()))
+        return lines
+
+    def refresh(self):
+        """Sets each line's text object to the profiler's current numbers, adding text objects as lines appear.
+        Lines whose text is unchanged are not laid out again."""
+        lines = self.lines()
+        while len(self._texts) < len(lines):
+            self._texts.append(arcade.Text("", self._x, self._y - 14 * len(self._texts), arcade.color.LIGHT_GREEN,
+                                           10, font_name="Courier New"))
+        del self._texts[len(lines):]
+        for text, line in zip(self._texts, lines):
+            text.text = line
+
+    def draw(self):
+        """Draws the overlay as small text in the top corner, refreshing it every few frames."""
+        if self._countdown <= 0:
+            self.refresh()
+            self._countdown = self._refresh
+        self._countdown -= 1
+        for text in self._texts:
+            text.draw()
+
+    # Getter properties are listed below
+    @property
+    def profiler(self):
+        return self._profiler
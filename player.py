@@ -0,0 +1,70 @@
+"""This file is for the Player class, which keeps one player's share of a World:
+their ship, score, lives lost and respawn counter."""
+
+import constants
+from ship import Ship
+from entity_store import minimum_image
+
+
+class Player:
+    """A class for one of the players in a World, each flying their own ship.
+    Ships are spread evenly across the middle of the screen, so a lone player starts in the centre."""
+    def __init__(self, number, players=1):
+        """Accepts the player's number, counting from 0, and how many players the world has."""
+        self._number = number
+        self._spawn_x = constants.SCREEN_WIDTH * (number + 1) / (players + 1)
+        self._ship = Ship()
+        self._ship.center.x = self._spawn_x
+
+        # A counter for when the ship is destroyed that will delay the ship's respawn
+        self.reset_counter = 0
+        # Points for every rock this player's bullets shot, and how many times their ship has been hit, this game
+        self.score = 0
+        self.lives_lost = 0
+        # Ship position, angle and whether it was alive as of the start of the last step, for drawing between steps
+        self.previous = (self._ship.center.x, self._ship.center.y, self._ship.angle, self._ship.alive)
+
+    def respawn(self):
+        """Resets the ship at the player's spawn point, if it has lives left."""
+        self._ship.reset()
+        if self._ship.alive:
+            self._ship.center.x = self._spawn_x
+
+    def remember(self):
+        """Records where the ship is before a step, so a view can interpolate between steps."""
+        ship = self._ship
+        self.previous = (ship.center.x, ship.center.y, ship.angle, ship.alive)
+
+    def interpolate(self, blend):
+        """Returns the ship's x, y and angle blended between the last two steps, the short way across a wrapped edge.
+        A ship that respawned or was parked off-screen is drawn where it is."""
+        previous_x, previous_y, previous_angle, previous_alive = self.previous
+        x = self._ship.center.x
+        y = self._ship.center.y
+        angle = self._ship.angle
+        if previous_alive != self._ship.alive:
+            return x, y, angle
+        return ((previous_x + minimum_image(x - previous_x, constants.SCREEN_WIDTH) * blend) % constants.SCREEN_WIDTH,
+                (previous_y + minimum_image(y - previous_y, constants.SCREEN_HEIGHT) * blend) % constants.SCREEN_HEIGHT,
+                previous_angle + (angle - previous_angle) * blend)
+
+    def state(self):
+        """Returns the player's simulation state as a tuple, for checksums."""
+        ship = self._ship
+        # Floats are normalised, since a ship reset to 0 holds an int that a restored snapshot holds as 0.0
+        return (float(ship.center.x), float(ship.center.y), float(ship.velocity.dx), float(ship.velocity.dy),
+                float(ship.angle), ship.alive, ship.lives, ship.firing_cooldown, self.reset_counter, self.score)
+
+    # Getter properties are listed below
+    @property
+    def number(self):
+        return self._number
+
+    @property
+    def ship(self):
+        return self._ship
+
+    @property
+    def out(self):
+        """True once the ship is destroyed with no lives left to respawn with."""
+        return not self._ship.alive and self._ship.lives <= 0
@@ -0,0 +1,87 @@
+"""This file is for the Object_Pool class, which keeps released objects so they can be spawned again
+instead of building new ones."""
+
+
+class Object_Pool:
+    """A class that hands out objects of one class, reusing released ones before creating new ones.
+    Reused objects are set up again through their spawn method."""
+    def __init__(self, object_class, size):
+        """Accepts the class to pool, and the most released objects to keep waiting for reuse."""
+        self._object_class = object_class
+        self._size = size
+        self._free = []
+        # Spawns served by a released object, and spawns that had to build a new one
+        self._hits = 0
+        self._misses = 0
+        # Objects currently handed out, and the most that were ever handed out at once
+        self._in_use = 0
+        self._high_water = 0
+
+    def spawn(self, *args):
+        """Returns a ready object, passing args to its spawn method or constructor."""
+        if self._free:
+            spawned = self._free.pop()
+            spawned.spawn(*args)
+            self._hits += 1
+        else:
+            spawned = self._object_class(*args)
+            self._misses += 1
+        self.hand_out()
+        return spawned
+
+    def restore(self, *args):
+        """Returns an object for a restored row, passing args to its restore method rather than setting it up
+        through spawn or its constructor."""
+        if self._free:
+            restored = self._free.pop()
+            self._hits += 1
+        else:
+            restored = self._object_class.__new__(self._object_class)
+            self._misses += 1
+        restored.restore(*args)
+        self.hand_out()
+        return restored
+
+    def hand_out(self):
+        """Counts an object handed out, and the most ever handed out at once."""
+        self._in_use += 1
+        if self._in_use > self._high_water:
+            self._high_water = self._in_use
+
+    def release(self, released):
+        """Takes back an object that has left the game, keeping it if the pool has room."""
+        self._in_use -= 1
+        if len(self._free) < self._size:
+            self._free.append(released)
+
+    def stats(self):
+        """Returns the pool's counters as a dictionary."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "in_use": self._in_use,
+            "high_water": self._high_water,
+            "free": len(self._free),
+            "size": self._size,
+        }
+
+    # Getter properties are listed below
+    @property
+    def object_class(self):
+        return self._object_class
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def high_water(self):
+        return self._high_water
@@ -0,0 +1,90 @@
+"""This file is for the Frame_Profiler class, which times each phase of a tick and of drawing a frame.
+Profiling is opt-in: a World or Game only calls the profiler when one is attached."""
+
+import json
+import time
+from collections import deque
+import numpy as np
+
+# Upper edges of the timing histogram buckets, in microseconds; the last bucket holds everything slower
+HISTOGRAM_EDGES = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class Frame_Profiler:
+    """A class that keeps rolling timings for named phases, entity counts and draw calls,
+    and a bounded trace of events that can be dumped in Chrome's trace event format."""
+    def __init__(self, window=240, trace_length=20000):
+        """Accepts how many recent samples to keep per phase, and how many trace events to keep."""
+        self._window = window
+        self._samples = {}
+        self._counts = {}
+        self._trace = deque(maxlen=trace_length)
+        self._origin = time.perf_counter()
+        self._last = self._origin
+
+    def start(self):
+        """Starts timing a tick or frame; the next mark measures from here."""
+        self._last = time.perf_counter()
+
+    def mark(self, phase, track="simulation"):
+        """Records the time since the last start or mark as one sample of the named phase."""
+        now = time.perf_counter()
+        duration = now - self._last
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = deque(maxlen=self._window)
+            self._samples[phase] = samples
+        samples.append(duration)
+        self._trace.append((phase, track, self._last - self._origin, duration))
+        self._last = now
+
+    def count(self, name, value):
+        """Records the latest value of a counter, such as how many bullets there are."""
+        self._counts[name] = value
+
+    def count_world(self, world):
+        """Records how many bullets there are, and how many asteroids of each class."""
+        self.count("bullets", len(world.bullets))
+        rocks = {}
+        for asteroid in world.asteroids:
+            name = type(asteroid).__name__
+            rocks[name] = rocks.get(name, 0) + 1
+        for name in ("Big_Rock", "Medium_Rock", "Small_Rock"):
+            self.count(name, rocks.get(name, 0))
+
+    def summary(self, phase):
+        """Returns the mean, p50, p95 and max of a phase's recent samples, in microseconds."""
+        samples = self._samples.get(phase)
+        if not samples:
+            return None
+        micros = np.array(samples) * 1e6
+        return {
+            "mean": float(micros.mean()),
+            "p50": float(np.percentile(micros, 50)),
+            "p95": float(np.percentile(micros, 95)),
+            "max": float(micros.max()),
+        }
+
+    def histogram(self, phase):
+        """Returns how many of a phase's recent samples fall in each HISTOGRAM_EDGES bucket."""
+        samples = self._samples.get(phase, ())
+        micros = np.array(samples) * 1e6
+        return np.bincount(np.searchsorted(HISTOGRAM_EDGES, micros, side="right"),
+                           minlength=len(HISTOGRAM_EDGES) + 1).tolist()
+
+    def dump_trace(self, path):
+        """Writes the kept events as a Chrome trace file, viewable in chrome://tracing or Perfetto."""
+        events = [{"name": phase, "cat": track, "ph": "X", "pid": 1, "tid": track,
+                   "ts": start * 1e6, "dur": duration * 1e6}
+                  for phase, track, start, duration in self._trace]
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": events, "counters": self._counts}, trace_file)
+
+    # Getter properties are listed below
+    @property
+    def phases(self):
+        return list(self._samples)
+
+    @property
+    def counts(self):
+        return dict(self._counts)
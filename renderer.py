@@ -0,0 +1,259 @@
+"""This file is for the Renderer classes, which draw the objects of a World with arcade.
+Renderer draws each object with its own call; Sprite_Renderer draws each kind of object as one sprite batch."""
+
+import math
+import arcade
+import constants
+import textures
+from trig_table import TABLE
+from ship import Ship
+from bullet import Bullet
+from asteroid_classes import Big_Rock, Medium_Rock, Small_Rock
+from ship_lives_display import Ship_Lives
+
+
+def ghost_positions(x, y, margin):
+    """Returns the places to draw an object centred at x, y: where it is on the screen, plus a ghost copy
+    past each edge it is within margin of, so objects slide across the wrapped edges instead of popping."""
+    x %= constants.SCREEN_WIDTH
+    y %= constants.SCREEN_HEIGHT
+    columns = [x]
+    if x < margin:
+        columns.append(x + constants.SCREEN_WIDTH)
+    elif x > constants.SCREEN_WIDTH - margin:
+        columns.append(x - constants.SCREEN_WIDTH)
+    rows = [y]
+    if y < margin:
+        rows.append(y + constants.SCREEN_HEIGHT)
+    elif y > constants.SCREEN_HEIGHT - margin:
+        rows.append(y - constants.SCREEN_HEIGHT)
+    return [(column, row) for column in columns for row in rows]
+
+
+class Renderer:
+    """A class that draws a world's flying objects.
+    Textures come from the shared texture registry, so the simulation never loads any."""
+    # Every image the renderer can draw, for preloading
+    texture_paths = [Ship.texture_path, Ship.thrusters_texture_path, Bullet.texture_path,
+                     Big_Rock.texture_path, Medium_Rock.texture_path, Small_Rock.texture_path,
+                     Ship_Lives.texture_path]
+
+    def __init__(self):
+        """Initializes the count of draw calls made this frame."""
+        self.draw_calls = 0
+
+    def start_frame(self):
+        """Resets the draw call count at the start of a frame."""
+        self.draw_calls = 0
+
+    def load_texture(self, img):
+        """Returns the shared texture record for an image."""
+        return textures.load_texture(img)
+
+    def draw(self, world, blend=1):
+        """Draws the bullets, asteroids and ships of a world.
+        :param blend: how far between the world's last two steps to draw objects, from 0 to 1
+        """
+        x, y, angle = world.bullet_store.interpolate(blend)
+        for bullet in world.bullets:
+            self.draw_object(bullet, x[bullet.index], y[bullet.index], angle[bullet.index])
+
+        x, y, angle = world.asteroid_store.interpolate(blend)
+        for asteroid in world.asteroids:
+            self.draw_object(asteroid, x[asteroid.index], y[asteroid.index], angle[asteroid.index])
+
+        self.draw_ships([(player.ship,) + player.interpolate(blend) for player in world.players])
+
+    def draw_object(self, flying_object, x, y, angle):
+        """Draws a bullet or asteroid at the given place, and its ghosts, based on the texture of its class."""
+        width, height, alpha, texture = self.load_texture(flying_object.texture_path)
+
+        for ghost_x, ghost_y in ghost_positions(x, y, math.hypot(width, height) / 2):
+            arcade.draw_texture_rectangle(ghost_x, ghost_y, width, height, texture, angle, alpha)
+            self.draw_calls += 1
+
+    def thrusters_placement(self, ship, x, y, angle):
+        """Returns the x, y, width, height, angle and alpha to draw the thrusters of a ship drawn at x, y and angle."""
+        texture2 = self.load_texture(ship.thrusters_texture_path).texture
+
+        width2 = texture2.width - ship.radius
+        height2 = texture2.height - ship.radius
+        alpha2 = 1
+        if ship.thrusters_on and ship.alive:
+            alpha2 = 255
+
+        # Uses the ship's own heading unless it is drawn part way through a turn
+        if angle == ship.angle:
+            heading_x, heading_y = ship.heading
+        else:
+            heading_x, heading_y = TABLE.vector(angle + 90)
+
+        # Determines whether to aim the thrusters forward or backward
+        if ship.thrusters_direction == "forward":
+            angle2 = angle + 180
+            x2 = x - (heading_x * ship.radius)
+            y2 = y - (heading_y * ship.radius)
+        elif ship.thrusters_direction == "backward":
+            angle2 = angle
+            # Adjusts the position of the thrusters slightly, to be placed at the correct position
+            x2 = x + (heading_x * (ship.radius - 10))
+            y2 = y + (heading_y * (ship.radius - 10))
+
+        return x2, y2, width2, height2, angle2, alpha2
+
+    def ship_positions(self, ship, x, y):
+        """Returns the places to draw a ship at x, y; a living ship gets ghosts near the edges, thrusters included."""
+        if not ship.alive:
+            return [(x, y)]
+        record = self.load_texture(ship.texture_path)
+        return ghost_positions(x, y, math.hypot(record.width, record.height) / 2 + ship.radius)
+
+    def draw_ships(self, placements):
+        """Draws every ship from a list of (ship, x, y, angle) placements."""
+        for ship, x, y, angle in placements:
+            self.draw_ship(ship, x, y, angle)
+
+    def draw_ship(self, ship, x, y, angle):
+        """Draws a ship and thrusters from image files, with the ship at x, y and angle."""
+        texture2 = self.load_texture(ship.thrusters_texture_path).texture
+        width, height, alpha, texture = self.load_texture(ship.texture_path)
+        if not ship.alive:
+            alpha = 1
+
+        for ghost_x, ghost_y in self.ship_positions(ship, x, y):
+            # Draws thrusters
+            x2, y2, width2, height2, angle2, alpha2 = self.thrusters_placement(ship, ghost_x, ghost_y, angle)
+            arcade.draw_texture_rectangle(x2, y2, width2, height2, texture2, angle2, alpha2)
+            self.draw_calls += 1
+
+            # Draws ship
+            arcade.draw_texture_rectangle(ghost_x, ghost_y, width, height, texture, angle, alpha)
+            self.draw_calls += 1
+
+
+class Sprite_Batch:
+    """A class that keeps one SpriteList of sprites sharing a texture, reusing its sprites from frame to frame."""
+    def __init__(self, record):
+        """Accepts the texture record every sprite in the batch is drawn with."""
+        self._record = record
+        # How close to an edge a sprite's center can be before part of it shows on the other side
+        self._margin = math.hypot(record.width, record.height) / 2
+        self._sprite_list = arcade.SpriteList()
+        self._sprites = []
+        # Number of sprites shown in the last frame
+        self._shown = 0
+
+    def sprite(self, number):
+        """Returns the sprite in the given position, creating sprites as the batch grows."""
+        while len(self._sprites) <= number:
+            sprite = arcade.Sprite(texture=self._record.texture, hit_box_algorithm="None")
+            self._sprites.append(sprite)
+            self._sprite_list.append(sprite)
+        return self._sprites[number]
+
+    def place(self, number, x, y, angle, alpha):
+        """Moves the sprite in the given position and makes it visible."""
+        sprite = self.sprite(number)
+        sprite.center_x = x
+        sprite.center_y = y
+        sprite.angle = angle
+        sprite.alpha = alpha
+        return sprite
+
+    def finish(self, shown):
+        """Hides the sprites that were shown last frame but are no longer needed."""
+        for number in range(shown, self._shown):
+            self._sprites[number].alpha = 0
+        self._shown = shown
+
+    def sync(self, objects):
+        """Places one sprite on each object given, at the place it is drawn."""
+        count = 0
+        for flying_object in objects:
+            self.place(count, flying_object.center.x, flying_object.center.y, flying_object.angle, self._record.alpha)
+            count += 1
+        self.finish(count)
+
+    def sync_rows(self, rows, x, y, angle):
+        """Places a sprite on each of the given store rows, and on their ghosts,
+        using interpolated position and angle arrays."""
+        alpha = self._record.alpha
+        margin = self._margin
+        count = 0
+        for row in rows:
+            for ghost_x, ghost_y in ghost_positions(x[row], y[row], margin):
+                self.place(count, ghost_x, ghost_y, angle[row], alpha)
+                count += 1
+        self.finish(count)
+
+    def draw(self):
+        """Draws every sprite in the batch in a single call, and returns how many calls were made."""
+        if self._shown:
+            self._sprite_list.draw()
+            return 1
+        return 0
+
+
+class Sprite_Renderer(Renderer):
+    """A renderer that keeps a persistent sprite batch for each kind of object.
+    Sprites are synced from the world every frame, so a frame costs a handful of draw calls
+    however many objects there are."""
+    def __init__(self):
+        """Initializes an empty batch for each image, created the first time it is drawn."""
+        super().__init__()
+        self._batches = {}
+
+    def batch(self, img):
+        """Returns the sprite batch for an image."""
+        batch = self._batches.get(img)
+        if batch is None:
+            batch = Sprite_Batch(self.load_texture(img))
+            self._batches[img] = batch
+        return batch
+
+    def draw(self, world, blend=1):
+        """Draws the bullets, asteroids and ships of a world, one batch per image.
+        :param blend: how far between the world's last two steps to draw objects, from 0 to 1
+        """
+        x, y, angle = world.bullet_store.interpolate(blend)
+        bullets = self.batch(Bullet.texture_path)
+        bullets.sync_rows([bullet.index for bullet in world.bullets], x, y, angle)
+        self.draw_calls += bullets.draw()
+
+        # Groups asteroid rows by the image of their class
+        x, y, angle = world.asteroid_store.interpolate(blend)
+        asteroids = {Big_Rock.texture_path: [], Medium_Rock.texture_path: [], Small_Rock.texture_path: []}
+        for asteroid in world.asteroids:
+            asteroids[asteroid.texture_path].append(asteroid.index)
+        for img, rows in asteroids.items():
+            batch = self.batch(img)
+            batch.sync_rows(rows, x, y, angle)
+            self.draw_calls += batch.draw()
+
+        self.draw_ships([(player.ship,) + player.interpolate(blend) for player in world.players])
+
+    def draw_ship(self, ship, x, y, angle):
+        """Draws a ship and thrusters through their batches, with the ship at x, y and angle."""
+        self.draw_ships([(ship, x, y, angle)])
+
+    def draw_ships(self, placements):
+        """Draws every ship and its thrusters through two batches, from a list of (ship, x, y, angle) placements."""
+        thrusters = self.batch(Ship.thrusters_texture_path)
+        body = self.batch(Ship.texture_path)
+
+        number = 0
+        for ship, x, y, angle in placements:
+            alpha = self.load_texture(ship.texture_path).alpha
+            if not ship.alive:
+                alpha = 1
+            for ghost_x, ghost_y in self.ship_positions(ship, x, y):
+                x2, y2, width2, height2, angle2, alpha2 = self.thrusters_placement(ship, ghost_x, ghost_y, angle)
+                sprite = thrusters.place(number, x2, y2, angle2, alpha2)
+                sprite.width = width2
+                sprite.height = height2
+                body.place(number, ghost_x, ghost_y, angle, alpha)
+                number += 1
+        thrusters.finish(number)
+        self.draw_calls += thrusters.draw()
+        body.finish(number)
+        self.draw_calls += body.draw()
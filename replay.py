@@ -0,0 +1,151 @@
+"""This file is for the Input_Log class, a compact binary recording of the inputs given to a World each tick,
+and for replaying a recording headless to reproduce a session exactly.
+Run it with: python replay.py session.replay [--until TICK] [--slowest N]"""
+
+import argparse
+import struct
+import time
+import constants
+from world import World
+from profiler import Frame_Profiler
+
+MAGIC = b"ASTRPLAY"
+# Bumped whenever a change to the rules makes older recordings play out differently
+VERSION = 9
+# Magic, version, world seed, tick count, a checksum of the world after the last tick,
+# and whether the world played endless waves, with its asteroid budget
+HEADER = struct.Struct("<8sHQI20s?I")
+# A run of identical ticks: how many, then the held and pressed INPUT_* flags
+RUN = struct.Struct("<HBB")
+LONGEST_RUN = 0xFFFF
+
+
+class Input_Log:
+    """A class that records the held and pressed inputs of every tick, run-length encoded,
+    along with the seed and mode of the world they were given to."""
+    def __init__(self, seed, endless=constants.ENDLESS_MODE, budget=constants.ASTEROID_BUDGET):
+        """Accepts the seed, mode and asteroid budget of the world being recorded."""
+        self._seed = seed
+        self._endless = endless
+        self._budget = budget
+        self._runs = []
+        self._ticks = 0
+        # Checksum of the recorded world after its last tick, filled in when the log is saved
+        self._checksum = bytes(20)
+
+    def record(self, held, pressed):
+        """Adds one tick of inputs to the log."""
+        runs = self._runs
+        if runs and runs[-1][1] == held and runs[-1][2] == pressed and runs[-1][0] < LONGEST_RUN:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, held, pressed])
+        self._ticks += 1
+
+    def inputs(self):
+        """Yields the held and pressed inputs of each recorded tick, in order."""
+        for count, held, pressed in self._runs:
+            for tick in range(count):
+                yield held, pressed
+
+    def save(self, path, world=None):
+        """Writes the log to a file. If the recorded world is given, its checksum is stored to verify replays against."""
+        if world is not None:
+            self._checksum = world.checksum()
+        with open(path, "wb") as log_file:
+            log_file.write(HEADER.pack(MAGIC, VERSION, self._seed, self._ticks, self._checksum,
+                                       self._endless, self._budget))
+            for count, held, pressed in self._runs:
+                log_file.write(RUN.pack(count, held, pressed))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a log written by save."""
+        with open(path, "rb") as log_file:
+            data = log_file.read()
+        magic, version, seed, ticks, checksum, endless, budget = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a version {} replay".format(path, VERSION))
+        log = cls(seed, endless, budget)
+        log._checksum = checksum
+        log._runs = [list(run) for run in RUN.iter_unpack(data[HEADER.size:])]
+        log._ticks = ticks
+        return log
+
+    # Getter properties are listed below
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def endless(self):
+        return self._endless
+
+    @property
+    def budget(self):
+        return self._budget
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    @property
+    def checksum(self):
+        return self._checksum
+
+
+def replay(log, until=None, profiler=None, on_tick=None):
+    """Re-simulates a log in a fresh headless World as fast as possible, and returns the world.
+    :param until: stop after this many ticks instead of at the end of the log
+    :param profiler: a Frame_Profiler to attach to the world while it runs
+    :param on_tick: called with the world after every tick
+    """
+    world = World(log.seed, log.endless, log.budget)
+    world.profiler = profiler
+    for held, pressed in log.inputs():
+        if until is not None and world.tick >= until:
+            break
+        world.step(held, pressed)
+        if on_tick:
+            on_tick(world)
+    return world
+
+
+def main():
+    """Replays a log from the command line, checks it against the recorded checksum, and lists the slowest ticks."""
+    parser = argparse.ArgumentParser(description="Replay a recorded asteroids session headless.")
+    parser.add_argument("path")
+    parser.add_argument("--until", type=int, help="stop after this many ticks")
+    parser.add_argument("--slowest", type=int, default=0, help="list the N slowest ticks")
+    options = parser.parse_args()
+
+    log = Input_Log.load(options.path)
+    tick_times = []
+    last = [time.perf_counter()]
+
+    def time_tick(world):
+        now = time.perf_counter()
+        tick_times.append((now - last[0], world.tick))
+        last[0] = now
+
+    # Keeps every tick's phase timings when looking for slow ticks
+    profiler = Frame_Profiler(window=max(log.ticks, 1)) if options.slowest else None
+    start = time.perf_counter()
+    world = replay(log, options.until, profiler, time_tick)
+    elapsed = time.perf_counter() - start
+
+    print("replayed {} of {} ticks in {:.3f}s ({:.0f} ticks/s)".format(
+        world.tick, log.ticks, elapsed, world.tick / elapsed if elapsed else 0))
+    if world.tick == log.ticks:
+        print("checksum", "matches" if world.checksum() == log.checksum else "DIFFERS")
+    for duration, tick in sorted(tick_times, reverse=True)[:options.slowest]:
+        print("tick {:>7}  {:>8.0f}us".format(tick, duration * 1e6))
+    if profiler:
+        for phase in profiler.phases:
+            summary = profiler.summary(phase)
+            print("{:<16} p50 {:>7.0f}us  p95 {:>7.0f}us  max {:>7.0f}us".format(
+                phase, summary["p50"], summary["p95"], summary["max"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""This file packs the simulation state of a World into a compact binary snapshot, and restores a World from one.
+Only numbers are saved: no textures, windows or views, so snapshots are small and quick enough for lookahead and rollback,
+and they can be written to disk as save-states."""
+
+import struct
+import numpy as np
+from bullet import Bullet
+from hitboxes import load_hitbox
+from player import Player
+from asteroid_classes import Big_Rock, Medium_Rock, Small_Rock
+
+MAGIC = b"ASTRSNAP"
+# Bumped whenever the layout below changes
+VERSION = 4
+# Magic and version
+HEADER = struct.Struct("<8sH")
+# Whether the world has a seed, the seed, tick, reset counter and STATE_* of the game,
+# then whether it plays endless waves, the wave, its asteroid budget and how many players it has
+WORLD = struct.Struct("<?qIiB?IIB")
+# Version of the random number generator's state, whether it holds a spare gaussian, and the spare
+RANDOM = struct.Struct("<i?d")
+# Words of Mersenne Twister state, followed by its position
+RANDOM_WORDS = 625
+# A player's ship position, velocity, angle, alive flag, lives, firing cooldown, thrusters on and pointing forward,
+# then its position, angle and alive flag as of the start of the last step,
+# then the player's reset counter, score and lives lost
+PLAYER = struct.Struct("<ddddd?ii??ddd?iqI")
+# Rows in a store, the serial the next object will get, and the first serial that counts as fresh
+STORE = struct.Struct("<Iqq")
+
+# Classes that can live in a store, numbered by their position here
+CLASSES = (Bullet, Big_Rock, Medium_Rock, Small_Rock)
+CLASS_CODES = {object_class: code for code, object_class in enumerate(CLASSES)}
+# Store arrays of floats that are saved, besides each row's serial and alive flag
+FLOAT_ARRAYS = ("x", "y", "dx", "dy", "angle", "spin", "radius", "life", "previous_x", "previous_y", "previous_angle")
+
+
+def pack(world):
+    """Returns the simulation state of a world as bytes."""
+    parts = [HEADER.pack(MAGIC, VERSION)]
+    seed = world.seed
+    parts.append(WORLD.pack(seed is not None, seed or 0, world.tick, world.reset_counter, world.state,
+                            world.endless, world.wave, world.budget, len(world.players)))
+
+    version, words, gauss = world.rng.getstate()
+    parts.append(RANDOM.pack(version, gauss is not None, gauss or 0.0))
+    parts.append(np.array(words, dtype=np.uint32).tobytes())
+
+    for player in world.players:
+        ship = player.ship
+        previous_x, previous_y, previous_angle, previous_alive = player.previous
+        parts.append(PLAYER.pack(ship.center.x, ship.center.y, ship.velocity.dx, ship.velocity.dy, ship.angle,
+                                 ship.alive, ship.lives, ship.firing_cooldown, ship.thrusters_on,
+                                 ship.thrusters_direction == "forward", previous_x, previous_y, previous_angle,
+                                 previous_alive, player.reset_counter, player.score, player.lives_lost))
+
+    bullets = pack_store(world.bullet_store, parts)
+    # The player that fired each bullet
+    parts.append(bytes(bullet.owner for bullet in bullets))
+    pack_store(world.asteroid_store, parts)
+    return b"".join(parts)
+
+
+def pack_store(store, parts):
+    """Appends the rows in use in a store to parts, in the order their objects were created, and returns their objects.
+    Row numbers are not saved; they don't change how a world plays out."""
+    rows = np.flatnonzero(store.used)
+    rows = rows[np.argsort(store.serial[rows], kind="stable")]
+    objects = [store.handle(row) for row in rows]
+    parts.append(STORE.pack(len(rows), store.next_serial, store.remembered_serial))
+    parts.append(bytes(CLASS_CODES[type(stored)] for stored in objects))
+    for name in FLOAT_ARRAYS:
+        parts.append(getattr(store, name)[rows].tobytes())
+    parts.append(store.serial[rows].tobytes())
+    parts.append(store.alive[rows].tobytes())
+    return objects
+
+
+def unpack(world, data):
+    """Replaces the simulation state of a world with a snapshot made by pack.
+    The world keeps its own stores, pools and profiler, so restoring does not build a new world."""
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a version {} snapshot".format(VERSION))
+    offset = HEADER.size
+
+    (has_seed, seed, world.tick, world.reset_counter, world.state, endless, world.wave, world.budget,
+     players) = WORLD.unpack_from(data, offset)
+    world.seed = seed if has_seed else None
+    world.endless = endless
+    offset += WORLD.size
+    if len(world.players) != players:
+        world.players = [Player(number, players) for number in range(players)]
+
+    random_version, has_gauss, gauss = RANDOM.unpack_from(data, offset)
+    offset += RANDOM.size
+    words = np.frombuffer(data, dtype=np.uint32, count=RANDOM_WORDS, offset=offset)
+    offset += words.nbytes
+
+    for player in world.players:
+        (x, y, dx, dy, angle, alive, lives, firing_cooldown, thrusters_on, forward, previous_x, previous_y,
+         previous_angle, previous_alive, player.reset_counter, player.score, player.lives_lost) = \
+            PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        ship = player.ship
+        ship.center.x = x
+        ship.center.y = y
+        ship.velocity.dx = dx
+        ship.velocity.dy = dy
+        ship.angle = angle
+        ship.alive = alive
+        ship.lives = lives
+        ship.firing_cooldown = firing_cooldown
+        ship.thrusters_on = thrusters_on
+        ship.thrusters_direction = "forward" if forward else "backward"
+        player.previous = (previous_x, previous_y, previous_angle, previous_alive)
+
+    world.bullets, offset = unpack_store(world.bullet_store, data, offset)
+    for bullet, owner in zip(world.bullets, data[offset:offset + len(world.bullets)]):
+        bullet.owner = owner
+    offset += len(world.bullets)
+    world.asteroids, offset = unpack_store(world.asteroid_store, data, offset, world.rng)
+    world.pending_asteroids.clear()
+
+    world.rng.setstate((random_version, tuple(words.tolist()), gauss if has_gauss else None))
+    return offset
+
+
+def unpack_store(store, data, offset, *args):
+    """Refills a store from the snapshot at offset, and returns its objects in creation order and the offset after them.
+    Any further arguments are passed on to each object's restore."""
+    count, next_serial, remembered_serial = STORE.unpack_from(data, offset)
+    offset += STORE.size
+    codes = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset)
+    offset += count
+
+    # Objects take the store's lowest rows without spawning, then every row is written from the saved values
+    objects = store.restore([CLASSES[code] for code in codes.tolist()], *args)
+    shapes = np.array([load_hitbox(object_class.texture_path).index for object_class in CLASSES], dtype=np.int64)
+    store.shape[:count] = shapes[codes]
+    for name in FLOAT_ARRAYS:
+        getattr(store, name)[:count] = np.frombuffer(data, dtype=np.float64, count=count, offset=offset)
+        offset += count * 8
+    store.serial[:count] = np.frombuffer(data, dtype=np.int64, count=count, offset=offset)
+    offset += count * 8
+    store.alive[:count] = np.frombuffer(data, dtype=bool, count=count, offset=offset)
+    offset += count
+    store.set_serials(next_serial, remembered_serial)
+    return objects, offset
@@ -0,0 +1,135 @@
+"""This file is a soak test: it runs idle and active sessions of the game headless for a long time,
+and checks that memory and tick time stay flat however long a session lasts,
+including a game left sitting on its game over screen.
+Run it with: python soak.py --minutes 120 --json soak.json"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import numpy as np
+import constants
+from world import World
+from batch_runner import aim_and_fire
+
+# Share of a session at the start that is left out of the baseline, while pools and arrays fill up
+WARM_UP = 0.25
+# Most the last quarter of a session may grow over the baseline before the test fails
+MEMORY_GROWTH = 0.10
+MEMORY_SLACK = 64 * 1024
+TIME_GROWTH = 0.50
+# Allocations made here, such as the samples themselves, are left out so only the world's memory is measured
+HARNESS_FILTERS = (tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__))
+
+
+def idle(world):
+    """Leaves the ship alone, so the game ends and then sits on its game over screen."""
+    return 0, 0
+
+
+def active(world):
+    """Aims and fires at the rocks, and starts a new game whenever one ends."""
+    if world.game_over:
+        return 0, constants.INPUT_RESTART
+    return aim_and_fire(world)
+
+
+# Sessions that can be soaked, by name
+SESSIONS = {
+    "idle": idle,
+    "active": active,
+}
+
+
+def soak(policy, seconds, seed, interval):
+    """Steps a world under a policy for the given seconds, and returns a sample of memory and tick times
+    for every interval of that many seconds."""
+    world = World(seed)
+    samples = []
+    gc.collect()
+    tracemalloc.start()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        durations = []
+        states = [0] * len(constants.STATE_NAMES)
+        interval_end = time.perf_counter() + interval
+        while time.perf_counter() < interval_end:
+            held, pressed = policy(world)
+            start = time.perf_counter()
+            world.step(held, pressed)
+            durations.append(time.perf_counter() - start)
+            states[world.state] += 1
+        micros = np.array(durations) * 1e6
+        sample = {
+            "tick": world.tick,
+            "step_p50_us": float(np.percentile(micros, 50)),
+            "step_p99_us": float(np.percentile(micros, 99)),
+            "states": dict(zip(constants.STATE_NAMES, states)),
+        }
+        sample["memory_bytes"] = world_memory()
+        samples.append(sample)
+    tracemalloc.stop()
+    return samples
+
+
+def world_memory():
+    """Returns the bytes still traced outside this harness."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(HARNESS_FILTERS)
+    return sum(trace.size for trace in snapshot.traces)
+
+
+def check_flat(samples):
+    """Returns a list of the ways the last quarter of a session grew past the baseline, which is empty if it stayed flat.
+    The baseline is the samples after the warm up, up to the last quarter."""
+    if len(samples) < 4:
+        return ["too few samples to judge; run for longer or use a shorter --interval"]
+    baseline = samples[int(len(samples) * WARM_UP):len(samples) * 3 // 4] or samples[:1]
+    last = samples[len(samples) * 3 // 4:]
+    failures = []
+
+    memory = max(sample["memory_bytes"] for sample in baseline)
+    grown = max(sample["memory_bytes"] for sample in last)
+    if grown > memory * (1 + MEMORY_GROWTH) + MEMORY_SLACK:
+        failures.append("memory grew from {} to {} bytes".format(memory, grown))
+
+    for field in ("step_p50_us", "step_p99_us"):
+        before = np.median([sample[field] for sample in baseline])
+        after = np.median([sample[field] for sample in last])
+        if after > before * (1 + TIME_GROWTH):
+            failures.append("{} grew from {:.1f} to {:.1f}".format(field, before, after))
+    return failures
+
+
+def main():
+    """Soaks each chosen session in turn, prints or saves the samples, and exits with 1 if any session grew."""
+    parser = argparse.ArgumentParser(description="Soak test headless asteroids sessions for flat memory and tick time.")
+    parser.add_argument("--minutes", type=float, default=60, help="minutes to run each session for")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between samples")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--session", action="append", choices=sorted(SESSIONS), help="only soak these sessions")
+    parser.add_argument("--json", help="write every session's samples and verdict to this file")
+    options = parser.parse_args()
+
+    report = {}
+    failed = False
+    for name in options.session or sorted(SESSIONS):
+        samples = soak(SESSIONS[name], options.minutes * 60, options.seed, options.interval)
+        failures = check_flat(samples)
+        failed = failed or bool(failures)
+        report[name] = {"samples": samples, "failures": failures}
+        first = samples[0]
+        last = samples[-1]
+        print("{:<8} {:>10} ticks  memory {:>9} -> {:>9} B  p99 {:>7.1f} -> {:>7.1f}us  {}".format(
+            name, last["tick"], first["memory_bytes"], last["memory_bytes"], first["step_p99_us"],
+            last["step_p99_us"], "; ".join(failures) or "flat"))
+
+    if options.json:
+        with open(options.json, "w") as output:
+            json.dump(report, output, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""This file is for the Spatial_Hash class, a broad phase that limits which pairs need a collision check."""
+
+import math
+import numpy as np
+import constants
+from entity_store import minimum_image
+
+# Multiplier that packs a cell's column and row into a single sortable key
+CELL_KEY_STRIDE = 1 << 32
+
+
+def circles_meet(offset_x, offset_y, motion_x, motion_y, reach):
+    """Returns whether two circles came closer than reach at any point during their last move.
+    offset is where the first circle ended up relative to the second, and motion is how far it moved relative to the second;
+    the closest point of that path is tested, so fast objects can't pass through each other between frames.
+    Works element-wise on arrays of any shape."""
+    start_x = offset_x - motion_x
+    start_y = offset_y - motion_y
+    length = motion_x * motion_x + motion_y * motion_y
+    along = np.clip(-(start_x * motion_x + start_y * motion_y) / np.where(length > 0, length, 1), 0, 1)
+    closest_x = start_x + motion_x * along
+    closest_y = start_y + motion_y * along
+    return closest_x * closest_x + closest_y * closest_y < reach * reach
+
+
+class Spatial_Hash:
+    """A class that sorts objects into cells, so only objects in neighbouring cells are compared.
+    The grid wraps around like the screen does, so objects on opposite edges are neighbours."""
+    def __init__(self, cell_size):
+        """Accepts the largest cell size, which works best a little larger than the furthest two objects can be apart
+        and still touch, since further reaches search more neighbouring cells.
+        Cells are shrunk slightly so a whole number of them tiles the screen."""
+        self._cell_size = cell_size
+        self._columns = math.ceil(constants.SCREEN_WIDTH / cell_size)
+        self._rows = math.ceil(constants.SCREEN_HEIGHT / cell_size)
+        self._cell_width = constants.SCREEN_WIDTH / self._columns
+        self._cell_height = constants.SCREEN_HEIGHT / self._rows
+
+    def cells(self, x, y):
+        """Returns the column and row of the cell holding each (x, y) pair in the given arrays,
+        wrapping positions past an edge onto the screen first."""
+        column = np.floor((x % constants.SCREEN_WIDTH) / self._cell_width).astype(np.int64) % self._columns
+        row = np.floor((y % constants.SCREEN_HEIGHT) / self._cell_height).astype(np.int64) % self._rows
+        return column, row
+
+    def cell_keys(self, x, y):
+        """Returns the key of the cell holding each (x, y) pair in the given arrays."""
+        column, row = self.cells(x, y)
+        return column * CELL_KEY_STRIDE + row
+
+    def overlapping_pairs(self, first_x, first_y, first_radius, second_x, second_y, second_radius,
+                          first_motion=None, second_motion=None):
+        """Returns two index arrays naming every (first, second) pair of circles that touch,
+        measuring between the nearest copies of each across the wrapped edges.
+        Pairs are sorted by the first index, then the second, so they come out in the same order as a nested loop.
+        :param first_motion: dx and dy arrays of how far each first object moved to reach its position;
+            when given for either group, pairs that touched at any point along the way are found, not only at the end
+        """
+        if first_motion is None:
+            first_motion = (np.zeros(len(first_x)), np.zeros(len(first_x)))
+        if second_motion is None:
+            second_motion = (np.zeros(len(second_x)), np.zeros(len(second_x)))
+        first_motion_x, first_motion_y = first_motion
+        second_motion_x, second_motion_y = second_motion
+
+        # Objects are filed by the middle of their move; two that touch along the way are at most this far apart there
+        reach = (_largest(first_radius) + _largest(second_radius) +
+                 (_largest(np.hypot(first_motion_x, first_motion_y)) +
+                  _largest(np.hypot(second_motion_x, second_motion_y))) / 2)
+        column_offsets = _offsets(math.ceil(reach / self._cell_width), self._columns)
+        row_offsets = _offsets(math.ceil(reach / self._cell_height), self._rows)
+
+        second_keys = self.cell_keys(second_x - second_motion_x / 2, second_y - second_motion_y / 2)
+        order = np.argsort(second_keys, kind="stable")
+        sorted_keys = second_keys[order]
+        first_columns, first_rows = self.cells(first_x - first_motion_x / 2, first_y - first_motion_y / 2)
+        first_indices = np.arange(len(first_x))
+
+        found_first = []
+        found_second = []
+        for column_offset in column_offsets:
+            columns = (first_columns + column_offset) % self._columns * CELL_KEY_STRIDE
+            for row_offset in row_offsets:
+                # Finds the run of sorted second objects that sits in the neighbouring cell
+                keys = columns + (first_rows + row_offset) % self._rows
+                start = np.searchsorted(sorted_keys, keys, side="left")
+                counts = np.searchsorted(sorted_keys, keys, side="right") - start
+                total = counts.sum()
+                if total == 0:
+                    continue
+                run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+                found_first.append(np.repeat(first_indices, counts))
+                found_second.append(order[np.repeat(start, counts) + np.arange(total) - run_starts])
+
+        if not found_first:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        first = np.concatenate(found_first)
+        second = np.concatenate(found_second)
+
+        # Exact circle test on the candidates, along their moves relative to each other
+        hits = circles_meet(minimum_image(first_x[first] - second_x[second], constants.SCREEN_WIDTH),
+                            minimum_image(first_y[first] - second_y[second], constants.SCREEN_HEIGHT),
+                            first_motion_x[first] - second_motion_x[second],
+                            first_motion_y[first] - second_motion_y[second],
+                            first_radius[first] + second_radius[second])
+        first = first[hits]
+        second = second[hits]
+        pair_order = np.lexsort((second, first))
+        return first[pair_order], second[pair_order]
+
+    # Getter properties are listed below
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def rows(self):
+        return self._rows
+
+
+def _offsets(span, cells):
+    """Returns the cell offsets to search on one axis, without visiting any cell twice when the span wraps all the way round."""
+    if 2 * span + 1 >= cells:
+        return range(cells)
+    return range(-span, span + 1)
+
+
+def _largest(values):
+    """Returns the largest of an array of values, or 0 if it is empty."""
+    return float(values.max()) if len(values) else 0.0
@@ -0,0 +1,72 @@
+"""This file is for the Spawn_Sampler class, which picks spawn coordinates away from a safe point in constant time."""
+
+import bisect
+from functools import lru_cache
+import numpy as np
+import constants
+
+
+class Spawn_Sampler:
+    """A class that picks a whole-number coordinate along one screen axis, leaving out a band around a safe point.
+    The allowed coordinates are stored as intervals, so a pick is one random number and a short search
+    instead of building and filtering a list of every coordinate."""
+    def __init__(self, length, low, high):
+        """Accepts the axis length, and the band [low, high) to leave out.
+        A band that runs past either edge wraps around to the other side, like the objects do."""
+        excluded = []
+        if high - low >= length:
+            excluded.append((0, length))
+        else:
+            for start, end in ((low, high), (low - length, high - length), (low + length, high + length)):
+                start = max(start, 0)
+                end = min(end, length)
+                if start < end:
+                    excluded.append((start, end))
+        excluded.sort()
+
+        # Allowed intervals in increasing order, with how many coordinates come before each
+        self._starts = []
+        self._offsets = []
+        self._count = 0
+        position = 0
+        for start, end in excluded + [(length, length)]:
+            if position < start:
+                self._starts.append(position)
+                self._offsets.append(self._count)
+                self._count += start - position
+            position = max(position, end)
+
+    def pick(self, number):
+        """Returns the allowed coordinate with the given position in increasing order."""
+        interval = bisect.bisect_right(self._offsets, number) - 1
+        return self._starts[interval] + number - self._offsets[interval]
+
+    def pick_many(self, numbers):
+        """Returns the allowed coordinates with an array of positions in increasing order."""
+        intervals = np.searchsorted(self._offsets, numbers, side="right") - 1
+        return np.asarray(self._starts)[intervals] + numbers - np.asarray(self._offsets)[intervals]
+
+    def sample(self, rng):
+        """Returns a random allowed coordinate.
+        This takes the same single draw from rng as random.choice over a sorted list of the allowed coordinates would."""
+        return self.pick(rng.randrange(self._count))
+
+    # Getter properties are listed below
+    @property
+    def count(self):
+        return self._count
+
+
+@lru_cache(maxsize=4096)
+def axis_sampler(length, margin, centre):
+    """Returns a shared sampler for an axis that leaves out margin on either side of centre."""
+    return Spawn_Sampler(length, int(centre - margin), int(centre + margin))
+
+
+def spawn_point(rng, radius, safe_x=constants.SCREEN_WIDTH / 2, safe_y=constants.SCREEN_HEIGHT / 2):
+    """Returns a random x and y on the screen that keeps a rock of the given radius clear of the safe point.
+    The safe point is wrapped onto the screen first, so a ship past an edge is still protected."""
+    margin = radius * 2
+    x = axis_sampler(constants.SCREEN_WIDTH, margin, safe_x % constants.SCREEN_WIDTH).sample(rng)
+    y = axis_sampler(constants.SCREEN_HEIGHT, margin, safe_y % constants.SCREEN_HEIGHT).sample(rng)
+    return x, y
@@ -0,0 +1,88 @@
+"""This file keeps every texture the game draws, so each image is loaded only once per process
+and every object drawn with it shares the same record.
+Images can be decoded on a background thread with Texture_Loader, so a window can open before they are ready."""
+
+import threading
+from collections import namedtuple
+import arcade
+
+# The data needed to draw an image; unpacks as width, height, alpha, texture
+Texture_Record = namedtuple("Texture_Record", ["width", "height", "alpha", "texture"])
+
+# Every record loaded so far, keyed by resource path
+_records = {}
+# Held while an image is decoded, so a loader thread and the window never load the same image twice
+_lock = threading.Lock()
+
+
+def load_texture(img):
+    """Returns the shared record for an image, loading the image only the first time it is asked for.
+    If another thread is loading images, this waits for it rather than loading the image a second time."""
+    record = _records.get(img)
+    if record is None:
+        with _lock:
+            record = _records.get(img)
+            if record is None:
+                texture = arcade.load_texture(img)
+
+                width = texture.width
+                height = texture.height
+                alpha = 255
+                record = Texture_Record(width, height, alpha, texture)
+                _records[img] = record
+    return record
+
+
+def preload(paths):
+    """Loads a group of images up front, so the first frames don't stall on loading them."""
+    for img in paths:
+        load_texture(img)
+
+
+def is_loaded(img):
+    """Returns true if an image has already been loaded."""
+    return img in _records
+
+
+class Texture_Loader:
+    """A class that decodes a group of images on a background thread.
+    Only image files are decoded there; textures reach the graphics card the first time they are drawn,
+    on the window's own thread."""
+    def __init__(self, paths):
+        """Accepts the images to load, and starts loading them straight away."""
+        self._paths = list(paths)
+        self._loaded = 0
+        self._error = None
+        self._thread = threading.Thread(target=self._load, name="texture-loader", daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        """Loads each image in turn, keeping any error for the window's thread to raise."""
+        try:
+            for img in self._paths:
+                load_texture(img)
+                self._loaded += 1
+        except Exception as error:
+            self._error = error
+
+    def wait(self, timeout=None):
+        """Blocks until loading has finished or the timeout runs out, and returns true if every image is loaded."""
+        self._thread.join(timeout)
+        return self.done
+
+    # Getter properties are listed below
+    @property
+    def done(self):
+        return self._loaded == len(self._paths)
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    @property
+    def total(self):
+        return len(self._paths)
+
+    @property
+    def error(self):
+        return self._error
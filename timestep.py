@@ -0,0 +1,62 @@
+"""This file is for the Fixed_Timestep class, which decides how many simulation ticks to run each rendered frame."""
+
+
+class Fixed_Timestep:
+    """A class that collects elapsed time and hands it out in fixed-length ticks,
+    so the game runs at the same speed whatever rate frames are drawn at."""
+    def __init__(self, tick_rate, max_ticks_per_frame):
+        """Accepts the number of ticks per second, and how many ticks a single frame may run to catch up."""
+        self._tick_length = 1 / tick_rate
+        self._max_ticks_per_frame = max_ticks_per_frame
+        self._accumulator = 0
+        # Total time thrown away because a frame fell further behind than the catch-up limit
+        self._dropped_time = 0
+        # Ticks handed out that could not be run yet, owed to later frames
+        self._owed_ticks = 0
+
+    def advance(self, delta_time):
+        """Adds the time since the last frame, and returns how many ticks should run now."""
+        self._accumulator += delta_time
+        ticks = int(self._accumulator / self._tick_length)
+
+        # A long stall would otherwise make every following frame run a burst of ticks
+        if ticks > self._max_ticks_per_frame:
+            ticks = self._max_ticks_per_frame
+            backlog = self._accumulator - ticks * self._tick_length
+            kept = backlog % self._tick_length
+            self._dropped_time += backlog - kept
+            self._accumulator = kept + ticks * self._tick_length
+
+        self._accumulator -= ticks * self._tick_length
+
+        # Owed ticks are never dropped, only spread over frames at up to the catch-up limit each
+        ticks += self._owed_ticks
+        self._owed_ticks = max(ticks - self._max_ticks_per_frame, 0)
+        return ticks - self._owed_ticks
+
+    def give_back(self, ticks):
+        """Takes back ticks handed out by advance that could not be run, such as while a network session waits
+        on another player, so they run on later frames rather than leaving the game behind for good."""
+        self._owed_ticks += ticks
+
+    # Getter properties are listed below
+    @property
+    def blend(self):
+        """Returns how far the time left over is into the next tick, from 0 to 1, for interpolating positions."""
+        return min(self._accumulator / self._tick_length, 1)
+
+    @property
+    def tick_length(self):
+        return self._tick_length
+
+    @property
+    def max_ticks_per_frame(self):
+        return self._max_ticks_per_frame
+
+    @property
+    def dropped_time(self):
+        return self._dropped_time
+
+    @property
+    def owed_ticks(self):
+        return self._owed_ticks
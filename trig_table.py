@@ -0,0 +1,50 @@
+"""This file is for cached sines and cosines: exact unit vectors for the few angles objects are
+launched at, and the Trig_Table class, a quantized table for looking up many angles at once."""
+
+import math
+from functools import lru_cache
+import numpy as np
+import constants
+
+
+@lru_cache(maxsize=1024)
+def unit_vector(degrees):
+    """Returns the cosine and sine of an angle in degrees.
+    The ship turns in SHIP_TURN_AMOUNT steps and rocks start at whole radians, so the same few angles come up again and again."""
+    radians = math.radians(degrees)
+    return math.cos(radians), math.sin(radians)
+
+
+class Trig_Table:
+    """A class that holds cosines and sines for angles rounded to a fixed step, for looking up arrays of angles
+    without calling numpy's trig functions each frame. Lookups are off by at most half a step."""
+    def __init__(self, steps=constants.TRIG_TABLE_STEPS):
+        """Accepts how many steps to divide a full turn into."""
+        self._steps = steps
+        self._steps_per_degree = steps / 360
+        radians = np.arange(steps) * (2 * math.pi / steps)
+        self._cos = np.cos(radians)
+        self._sin = np.sin(radians)
+
+    def indices(self, degrees):
+        """Returns the table rows of an array of angles in degrees."""
+        return np.rint(np.asarray(degrees) * self._steps_per_degree).astype(np.int64) % self._steps
+
+    def vectors(self, degrees):
+        """Returns arrays of the cosines and sines of an array of angles in degrees."""
+        rows = self.indices(degrees)
+        return self._cos[rows], self._sin[rows]
+
+    def vector(self, degrees):
+        """Returns the cosine and sine of a single angle in degrees."""
+        row = int(round(degrees * self._steps_per_degree)) % self._steps
+        return float(self._cos[row]), float(self._sin[row])
+
+    # Getter properties are listed below
+    @property
+    def steps(self):
+        return self._steps
+
+
+# A shared table, for views and bulk code that can live with angles rounded to TRIG_TABLE_STEPS
+TABLE = Trig_Table()
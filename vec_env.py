@@ -0,0 +1,355 @@
+"""This file is for the Vec_Env class, which plays many games at once for training agents.
+The state of every world is kept in arrays with one row per world, so a step is a few vectorized passes
+over all worlds together rather than a Python loop over World objects."""
+
+import numpy as np
+import constants
+from entity_store import minimum_image
+from hitboxes import load_hitbox
+from asteroid_classes import Big_Rock, Medium_Rock, Small_Rock
+from bullet import Bullet
+from ship import Ship
+from spatial_hash import circles_meet
+from spawn_sampler import axis_sampler
+from trig_table import TABLE
+
+# Columns of an action array, each one holding its input down while it is non-zero
+ACTIONS = (constants.INPUT_TURN_LEFT, constants.INPUT_TURN_RIGHT, constants.INPUT_THRUST,
+           constants.INPUT_REVERSE, constants.INPUT_FIRE)
+
+# Rock kinds, indexing the tables below
+BIG, MEDIUM, SMALL = 0, 1, 2
+# Radii of the circles bounding each kind's hit shape, the same circles World's broad phase uses
+RADII = np.array([load_hitbox(rock.texture_path).radius for rock in (Big_Rock, Medium_Rock, Small_Rock)])
+SHIP_RADIUS = load_hitbox(Ship.texture_path).radius
+BULLET_RADIUS = load_hitbox(Bullet.texture_path).radius
+SPINS = np.array([constants.BIG_ROCK_SPIN, constants.MEDIUM_ROCK_SPIN, constants.SMALL_ROCK_SPIN], dtype=float)
+POINTS = np.array([constants.BIG_ROCK_POINTS, constants.MEDIUM_ROCK_POINTS, constants.SMALL_ROCK_POINTS], dtype=float)
+# What each kind breaks into: the fragment's kind and the velocity it adds to the broken rock's, as in break_apart
+FRAGMENTS = (
+    ((MEDIUM, 0, 2), (MEDIUM, 0, -2), (SMALL, 5, 0)),
+    ((SMALL, 1.5, 1.5), (SMALL, -1.5, -1.5)),
+    (),
+)
+
+# Ship values in each observation: position, velocity, heading and whether it is alive
+SHIP_FEATURES = 7
+# Values per rock in each observation: offset from the ship, velocity and radius
+ROCK_FEATURES = 5
+
+# A bullet lives for BULLET_LIFE ticks and the ship fires at most once every FIRING_COOLDOWN, so slots are reused in turn
+BULLET_SLOTS = constants.BULLET_LIFE // constants.FIRING_COOLDOWN + 1
+
+
+class Vec_Env:
+    """A class that steps many independent games with the rules of World, in the style of a gym vector environment.
+    Each world is a row of the arrays below; rocks and bullets have a column per slot.
+    Objects collide as the circles bounding their hit shapes rather than as the shapes themselves,
+    and hits within a tick are resolved in slot order rather than creation order, so a Vec_Env plays
+    by close to the rules of a World without reproducing a World's game exactly."""
+    def __init__(self, count, seed=None, nearest=8, rock_capacity=32):
+        """Accepts how many worlds to play, a seed for all of their random numbers,
+        how many of the nearest rocks each observation describes, and the starting number of rock slots per world."""
+        self._count = count
+        self._nearest = nearest
+        self._rng = np.random.default_rng(seed)
+        self._worlds = np.arange(count)
+        self._rock_capacity = 0
+
+        self.ship_x = np.zeros(count)
+        self.ship_y = np.zeros(count)
+        self.ship_dx = np.zeros(count)
+        self.ship_dy = np.zeros(count)
+        self.ship_angle = np.zeros(count)
+        self.ship_alive = np.zeros(count, dtype=bool)
+        self.lives = np.zeros(count, dtype=np.int64)
+        self.firing_cooldown = np.zeros(count, dtype=np.int64)
+        self.reset_counter = np.zeros(count, dtype=np.int64)
+        self.shots = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count)
+
+        self.bullet_x = np.zeros((count, BULLET_SLOTS))
+        self.bullet_y = np.zeros((count, BULLET_SLOTS))
+        self.bullet_dx = np.zeros((count, BULLET_SLOTS))
+        self.bullet_dy = np.zeros((count, BULLET_SLOTS))
+        self.bullet_life = np.zeros((count, BULLET_SLOTS), dtype=np.int64)
+        self.bullet_alive = np.zeros((count, BULLET_SLOTS), dtype=bool)
+
+        self.rock_x = np.zeros((count, 0))
+        self.rock_y = np.zeros((count, 0))
+        self.rock_dx = np.zeros((count, 0))
+        self.rock_dy = np.zeros((count, 0))
+        self.rock_angle = np.zeros((count, 0))
+        self.rock_kind = np.zeros((count, 0), dtype=np.int64)
+        self.rock_alive = np.zeros((count, 0), dtype=bool)
+        # Rocks spawned this tick, which have not moved yet
+        self.rock_fresh = np.zeros((count, 0), dtype=bool)
+        self.grow_rocks(rock_capacity)
+
+    def grow_rocks(self, capacity):
+        """Enlarges the rock arrays to hold at least the given number of rocks per world."""
+        if capacity <= self._rock_capacity:
+            return
+        extra = ((0, 0), (0, capacity - self._rock_capacity))
+        for name in ("rock_x", "rock_y", "rock_dx", "rock_dy", "rock_angle", "rock_kind", "rock_alive",
+                     "rock_fresh"):
+            setattr(self, name, np.pad(getattr(self, name), extra))
+        self._rock_capacity = capacity
+
+    def reset(self):
+        """Starts a new game in every world, and returns the first observations."""
+        self.reset_worlds(self._worlds)
+        return self.observe()
+
+    def reset_worlds(self, worlds):
+        """Starts a new game in the given worlds, like World.reset_game."""
+        self.reset_counter[worlds] = 0
+        self.score[worlds] = 0
+        self.lives[worlds] = constants.SHIP_LIVES
+        self.respawn_ships(worlds)
+        self.firing_cooldown[worlds] = constants.FIRING_COOLDOWN
+        self.bullet_alive[worlds] = False
+        self.rock_alive[worlds] = False
+        self.spawn_wave(worlds, constants.INITIAL_ROCK_COUNT)
+
+    def respawn_ships(self, worlds):
+        """Puts the ships of the given worlds back in the middle of the screen, still and facing up."""
+        self.ship_x[worlds] = constants.SCREEN_WIDTH / 2
+        self.ship_y[worlds] = constants.SCREEN_HEIGHT / 2
+        self.ship_dx[worlds] = 0
+        self.ship_dy[worlds] = 0
+        self.ship_angle[worlds] = 0
+        self.ship_alive[worlds] = True
+
+    def spawn_wave(self, worlds, count):
+        """Adds count big rocks to each of the given worlds, clear of the middle of the screen where ships respawn."""
+        worlds = np.repeat(worlds, count)
+        total = len(worlds)
+        x_sampler = axis_sampler(constants.SCREEN_WIDTH, RADII[BIG] * 2, constants.SCREEN_WIDTH / 2)
+        y_sampler = axis_sampler(constants.SCREEN_HEIGHT, RADII[BIG] * 2, constants.SCREEN_HEIGHT / 2)
+        x = x_sampler.pick_many(self._rng.integers(0, x_sampler.count, total)).astype(float)
+        y = y_sampler.pick_many(self._rng.integers(0, y_sampler.count, total)).astype(float)
+        # Rocks head off at a whole number of radians, like Asteroid.spawn
+        angle = np.degrees(self._rng.integers(0, 361, total).astype(float))
+        dx, dy = TABLE.vectors(angle)
+        self.spawn_rocks(worlds, np.full(total, BIG), x, y, dx * constants.BIG_ROCK_SPEED,
+                         dy * constants.BIG_ROCK_SPEED, angle)
+
+    def spawn_rocks(self, worlds, kinds, x, y, dx, dy, angle):
+        """Puts new rocks into free slots; every argument is an array with one entry per rock."""
+        if not len(worlds):
+            return
+        counts = np.bincount(worlds, minlength=self._count)
+        free = self._rock_capacity - self.rock_alive.sum(axis=1)
+        if np.any(counts > free):
+            self.grow_rocks(max(self._rock_capacity * 2, self._rock_capacity + int((counts - free).max())))
+
+        # Ranks each new rock among those going to the same world, and gives it that world's free slot of that rank
+        order = np.argsort(worlds, kind="stable")
+        worlds = worlds[order]
+        starts = np.cumsum(counts) - counts
+        ranks = np.arange(len(worlds)) - starts[worlds]
+        free_slots = np.argsort(self.rock_alive, axis=1, kind="stable")
+        slots = free_slots[worlds, ranks]
+
+        self.rock_x[worlds, slots] = x[order]
+        self.rock_y[worlds, slots] = y[order]
+        self.rock_dx[worlds, slots] = dx[order]
+        self.rock_dy[worlds, slots] = dy[order]
+        self.rock_angle[worlds, slots] = angle[order]
+        self.rock_kind[worlds, slots] = kinds[order]
+        self.rock_alive[worlds, slots] = True
+        self.rock_fresh[worlds, slots] = True
+
+    def step(self, actions):
+        """Advances every world by one tick.
+        :param actions: a (count, len(ACTIONS)) array; a non-zero entry holds that input down this tick
+        :returns: observations, rewards (points scored this tick) and done flags; finished worlds start a new game
+        """
+        actions = np.asarray(actions) != 0
+        score_before = self.score.copy()
+        self.check_keys(actions)
+        self.check_collisions()
+        dones = self.check_resets()
+        self.advance()
+
+        rewards = self.score - score_before
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            self.reset_worlds(finished)
+        return self.observe(), rewards, dones
+
+    def check_keys(self, actions):
+        """Turns, thrusts and fires every ship from its row of actions, like World.check_keys."""
+        # Wrecked ships ignore every input until they respawn
+        turn = (actions[:, 0].astype(float) - actions[:, 1]) * self.ship_alive
+        thrust = (actions[:, 2].astype(float) - actions[:, 3]) * self.ship_alive
+        self.ship_angle += turn * constants.SHIP_TURN_AMOUNT
+        heading_x, heading_y = TABLE.vectors(self.ship_angle + 90)
+        self.ship_dx += heading_x * constants.SHIP_THRUST_AMOUNT * thrust
+        self.ship_dy += heading_y * constants.SHIP_THRUST_AMOUNT * thrust
+
+        firing = np.flatnonzero(actions[:, 4] & self.ship_alive &
+                                (self.firing_cooldown >= constants.FIRING_COOLDOWN))
+        if len(firing):
+            slots = self.shots[firing] % BULLET_SLOTS
+            self.shots[firing] += 1
+            self.firing_cooldown[firing] = 0
+            # Starts the bullet slightly in front of the ship, moving with it, as in Ship.fire
+            offset = (constants.SHIP_RADIUS + constants.BULLET_RADIUS) / 2
+            self.bullet_x[firing, slots] = self.ship_x[firing] + heading_x[firing] * offset
+            self.bullet_y[firing, slots] = self.ship_y[firing] + heading_y[firing] * offset
+            self.bullet_dx[firing, slots] = heading_x[firing] * constants.BULLET_SPEED + self.ship_dx[firing]
+            self.bullet_dy[firing, slots] = heading_y[firing] * constants.BULLET_SPEED + self.ship_dy[firing]
+            self.bullet_life[firing, slots] = 0
+            self.bullet_alive[firing, slots] = True
+
+    def check_collisions(self):
+        """Checks ships against rocks, then bullets against rocks in passes until no more hits are found.
+        Each pass lets every rock take the first bullet touching it, and each bullet the first rock that takes it;
+        fragments are checked in the passes after they appear, as in World.check_collisions."""
+        radius = RADII[self.rock_kind]
+        rock_motion_x = np.where(self.rock_fresh, 0.0, self.rock_dx)
+        rock_motion_y = np.where(self.rock_fresh, 0.0, self.rock_dy)
+
+        # Ships against every rock of their world at once, along the paths both took last frame
+        hit = (self.rock_alive & circles_meet(self.rock_offsets_x(), self.rock_offsets_y(),
+                                              rock_motion_x - self.ship_dx[:, None], rock_motion_y - self.ship_dy[:, None],
+                                              SHIP_RADIUS + radius)).any(axis=1) & self.ship_alive
+        self.ship_alive[hit] = False
+        self.lives[hit] -= 1
+        # Parks wrecked ships off the screen, like Ship.hit
+        self.ship_x[hit] = constants.SCREEN_WIDTH * 2
+        self.ship_y[hit] = constants.SCREEN_HEIGHT * 2
+
+        # Bullets fired this tick have not moved yet
+        bullet_moved = self.bullet_life > 0
+        bullet_motion_x = np.where(bullet_moved, self.bullet_dx, 0.0)[:, :, None]
+        bullet_motion_y = np.where(bullet_moved, self.bullet_dy, 0.0)[:, :, None]
+        while self.bullet_alive.any():
+            radius = RADII[self.rock_kind]
+            rock_motion_x = np.where(self.rock_fresh, 0.0, self.rock_dx)[:, None, :]
+            rock_motion_y = np.where(self.rock_fresh, 0.0, self.rock_dy)[:, None, :]
+            touching = (self.bullet_alive[:, :, None] & self.rock_alive[:, None, :] &
+                        circles_meet(minimum_image(self.bullet_x[:, :, None] - self.rock_x[:, None, :],
+                                                   constants.SCREEN_WIDTH),
+                                     minimum_image(self.bullet_y[:, :, None] - self.rock_y[:, None, :],
+                                                   constants.SCREEN_HEIGHT),
+                                     bullet_motion_x - rock_motion_x, bullet_motion_y - rock_motion_y,
+                                     (BULLET_RADIUS + radius)[:, None, :]))
+            worlds, rocks = np.nonzero(touching.any(axis=1))
+            if not len(worlds):
+                break
+            bullets = touching[worlds, :, rocks].argmax(axis=1)
+            # A bullet touched by several rocks goes to the lowest slot; the others try again next pass
+            taker = np.full((self._count, BULLET_SLOTS), self._rock_capacity)
+            np.minimum.at(taker, (worlds, bullets), rocks)
+            taken = taker[worlds, bullets] == rocks
+            worlds, rocks, bullets = worlds[taken], rocks[taken], bullets[taken]
+
+            self.bullet_alive[worlds, bullets] = False
+            self.rock_alive[worlds, rocks] = False
+            kinds = self.rock_kind[worlds, rocks]
+            np.add.at(self.score, worlds, POINTS[kinds])
+            self.break_apart(worlds, rocks, kinds)
+
+    def break_apart(self, worlds, rocks, kinds):
+        """Spawns the fragments of the given broken rocks, where they were and with their velocity plus a push."""
+        # Reads every broken rock before any fragment can be given one of their freed slots
+        x = self.rock_x[worlds, rocks]
+        y = self.rock_y[worlds, rocks]
+        dx = self.rock_dx[worlds, rocks]
+        dy = self.rock_dy[worlds, rocks]
+        for kind, fragments in enumerate(FRAGMENTS):
+            broken = kinds == kind
+            if not fragments or not broken.any():
+                continue
+            total = int(broken.sum())
+            for fragment_kind, push_x, push_y in fragments:
+                angle = np.degrees(self._rng.integers(0, 361, total).astype(float))
+                self.spawn_rocks(worlds[broken], np.full(total, fragment_kind), x[broken], y[broken],
+                                 dx[broken] + push_x, dy[broken] + push_y, angle)
+
+    def check_resets(self):
+        """Counts down to respawning wrecked ships, and returns which worlds' games are over, like World.check_resets."""
+        dead = ~self.ship_alive
+        cleared = self.ship_alive & ~self.rock_alive.any(axis=1)
+        self.reset_counter[dead | cleared] += 1
+
+        respawning = np.flatnonzero(dead & (self.reset_counter >= constants.RESET_COUNTER) & (self.lives > 0))
+        if len(respawning):
+            self.respawn_ships(respawning)
+            self.reset_counter[respawning] = 0
+
+        return (dead | cleared) & (self.reset_counter >= constants.GAME_RESET_COUNTER)
+
+    def advance(self):
+        """Moves every living ship, bullet and rock, wrapping around the screen's edges, turns the rocks,
+        and ages the bullets. Wrecked ships stay parked until they respawn."""
+        alive = self.ship_alive
+        self.ship_x[alive] = (self.ship_x[alive] + self.ship_dx[alive]) % constants.SCREEN_WIDTH
+        self.ship_y[alive] = (self.ship_y[alive] + self.ship_dy[alive]) % constants.SCREEN_HEIGHT
+        self.firing_cooldown += 1
+
+        self.bullet_x += self.bullet_dx
+        self.bullet_x %= constants.SCREEN_WIDTH
+        self.bullet_y += self.bullet_dy
+        self.bullet_y %= constants.SCREEN_HEIGHT
+        self.bullet_life += 1
+        self.bullet_alive &= self.bullet_life < constants.BULLET_LIFE
+
+        self.rock_x += self.rock_dx
+        self.rock_x %= constants.SCREEN_WIDTH
+        self.rock_y += self.rock_dy
+        self.rock_y %= constants.SCREEN_HEIGHT
+        self.rock_fresh[:] = False
+        self.rock_angle += SPINS[self.rock_kind]
+
+    def rock_offsets_x(self):
+        """Returns each rock's x offset from its world's ship, the short way across the wrapped edges."""
+        return minimum_image(self.rock_x - self.ship_x[:, None], constants.SCREEN_WIDTH)
+
+    def rock_offsets_y(self):
+        """Returns each rock's y offset from its world's ship, the short way across the wrapped edges."""
+        return minimum_image(self.rock_y - self.ship_y[:, None], constants.SCREEN_HEIGHT)
+
+    def observe(self):
+        """Returns a (count, SHIP_FEATURES + nearest * ROCK_FEATURES) array describing each world:
+        the ship's position, velocity, heading and alive flag, then the nearest rocks' offsets from the ship,
+        velocities and radii, nearest first. Missing rocks are all zeros."""
+        heading_x, heading_y = TABLE.vectors(self.ship_angle + 90)
+        ship = np.stack((self.ship_x, self.ship_y, self.ship_dx, self.ship_dy,
+                         heading_x, heading_y, self.ship_alive), axis=1)
+
+        offset_x = self.rock_offsets_x()
+        offset_y = self.rock_offsets_y()
+        distance = np.where(self.rock_alive, offset_x * offset_x + offset_y * offset_y, np.inf)
+        nearest = min(self._nearest, self._rock_capacity)
+        if nearest < self._rock_capacity:
+            slots = np.argpartition(distance, nearest, axis=1)[:, :nearest]
+        else:
+            slots = np.broadcast_to(np.arange(self._rock_capacity), distance.shape)
+        slots = np.take_along_axis(slots, np.argsort(np.take_along_axis(distance, slots, axis=1), axis=1), axis=1)
+
+        worlds = self._worlds[:, None]
+        rocks = np.stack((offset_x[worlds, slots], offset_y[worlds, slots], self.rock_dx[worlds, slots],
+                          self.rock_dy[worlds, slots], RADII[self.rock_kind[worlds, slots]]), axis=2)
+        rocks[~self.rock_alive[worlds, slots]] = 0
+
+        observations = np.zeros((self._count, SHIP_FEATURES + self._nearest * ROCK_FEATURES), dtype=np.float32)
+        observations[:, :SHIP_FEATURES] = ship
+        observations[:, SHIP_FEATURES:SHIP_FEATURES + nearest * ROCK_FEATURES] = rocks.reshape(self._count, -1)
+        return observations
+
+    # Getter properties are listed below
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def rock_capacity(self):
+        return self._rock_capacity
+
+    @property
+    def observation_size(self):
+        return SHIP_FEATURES + self._nearest * ROCK_FEATURES
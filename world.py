@@ -0,0 +1,471 @@
+"""This file is for the World class, which holds the rules of the game without drawing anything.
+The arcade Game window is only a view over a World, so a World can be stepped headless for bots, replays or tests.
+A World can hold several players, each flying their own ship; the first player's ship is also world.ship."""
+
+import hashlib
+import math
+import random
+import numpy as np
+import constants
+import snapshot
+from player import Player
+from asteroid_classes import Big_Rock, Medium_Rock, Small_Rock
+from bullet import Bullet
+from hitboxes import load_hitbox, shapes_meet, narrow, exact_meet
+from spatial_hash import Spatial_Hash, circles_meet
+from entity_store import Entity_Store, minimum_image
+
+
+class World:
+    """A class that owns the players' ships, bullets, asteroids and counters, and advances them one frame per step."""
+    def __init__(self, seed=None, endless=constants.ENDLESS_MODE, budget=constants.ASTEROID_BUDGET, players=1):
+        """Sets up the initial conditions of the game.
+        :param seed: seeds the world's own random number generator; the same seed and inputs replay the same game
+        :param endless: sends bigger, faster waves of rocks each time the field is cleared, instead of ending the game
+        :param budget: most asteroids kept alive at once; past it rocks break into fewer fragments
+        :param players: how many ships there are, each steered by its own inputs
+        """
+        self.seed = seed
+        self.endless = endless
+        self.budget = budget
+        self.rng = random.Random(seed)
+        self.players = [Player(number, players) for number in range(players)]
+        # Bullets and asteroids keep their state in array-backed stores, so each group is moved in one pass
+        self.bullet_store = Entity_Store()
+        self.asteroid_store = Entity_Store()
+        self.bullets = []
+        # Buckets bullets each frame; cells are as wide as the furthest a bullet and rock can be apart and still touch,
+        # plus room for the distance they moved, so a hit is usually found in the neighbouring cells
+        self.bullet_hash = Spatial_Hash(load_hitbox(Bullet.texture_path).radius + max(
+                load_hitbox(rock.texture_path).radius for rock in (Big_Rock, Medium_Rock, Small_Rock))
+                + constants.BULLET_SPEED)
+        # Buckets small rocks when there are enough asteroids that nearby ones are merged
+        self.merge_hash = Spatial_Hash(constants.MERGE_DISTANCE)
+
+        # Creates asteroids list, populated based on the INITAL_ROCK_COUNT constant
+        self.asteroids = []
+        # The wave being played; only endless mode gets past the first
+        self.wave = 1
+        self.spawn_wave(constants.INITIAL_ROCK_COUNT)
+        # Asteroids spawned by break_apart during a tick, added to the list once the tick's collisions are done
+        self.pending_asteroids = []
+
+        # A counter for when every asteroid is destroyed that will delay the next wave, or the end of the game
+        self.reset_counter = 0
+
+        # Which STATE_* the game is in; the game ends in STATE_GAME_OVER, until it is restarted
+        self.state = constants.STATE_PLAYING
+
+        # Number of steps taken since the world was created
+        self.tick = 0
+
+        # An optional Frame_Profiler; while one is attached, every phase of a step is timed
+        self.profiler = None
+
+    def step(self, held=0, pressed=0):
+        """Advances the world by one frame, with inputs for the first player only.
+        :param held: INPUT_* flags for inputs that are held down this frame
+        :param pressed: INPUT_* flags for inputs that were pressed since the last frame
+        """
+        self.step_players(((held, pressed),))
+
+    def step_players(self, inputs):
+        """Advances the world by one frame.
+        :param inputs: a held and pressed pair of INPUT_* flags for each player, in player order;
+            players past the end of inputs get none
+        """
+        profiler = self.profiler
+        if profiler:
+            profiler.start()
+
+        self.remember()
+        for number, player in enumerate(self.players):
+            held, pressed = inputs[number] if number < len(inputs) else (0, 0)
+            self.check_presses(player, pressed)
+            self.check_keys(player, held)
+        if profiler:
+            profiler.mark("check_keys")
+        self.check_collisions()
+        if profiler:
+            profiler.mark("check_collisions")
+        self.check_resets()
+        if profiler:
+            profiler.mark("check_resets")
+        self.advance()
+        if profiler:
+            profiler.mark("advance")
+            profiler.count_world(self)
+
+        self.tick += 1
+
+    def advance(self):
+        """Moves the ships, then every bullet and asteroid a store at a time, and ages the bullets.
+        Everything wraps around the screen's edges as it moves, so there is no separate pass for objects off the screen."""
+        for player in self.players:
+            player.ship.advance()
+
+        self.bullet_store.advance()
+        self.bullet_store.age(constants.BULLET_LIFE)
+
+        self.asteroid_store.advance()
+
+    def remember(self):
+        """Records where everything is before a step, so a view can interpolate between steps."""
+        for player in self.players:
+            player.remember()
+        self.bullet_store.remember()
+        self.asteroid_store.remember()
+
+    def interpolate_ship(self, blend, number=0):
+        """Returns a player's ship x, y and angle blended between the last two steps."""
+        return self.players[number].interpolate(blend)
+
+    def checksum(self):
+        """Returns a digest of the simulation state, for checking that a replay matched the original run."""
+        digest = hashlib.sha1()
+        digest.update(repr((self.tick, self.reset_counter, self.state,
+                            [player.state() for player in self.players])).encode())
+        for store in (self.bullet_store, self.asteroid_store):
+            rows = store.live_indices()
+            for values in (store.x, store.y, store.dx, store.dy, store.angle, store.life):
+                digest.update(values[rows].tobytes())
+        return digest.digest()
+
+    def snapshot(self):
+        """Returns the simulation state as compact bytes, for lookahead, rollback or save-states."""
+        return snapshot.pack(self)
+
+    def restore(self, data):
+        """Puts the world back into the state of a snapshot."""
+        snapshot.unpack(self, data)
+
+    def save_state(self, path):
+        """Writes a snapshot of the world to a file."""
+        with open(path, "wb") as state_file:
+            state_file.write(self.snapshot())
+
+    @classmethod
+    def load_state(cls, path):
+        """Returns a new world in the state saved to a file by save_state."""
+        with open(path, "rb") as state_file:
+            data = state_file.read()
+        world = cls()
+        world.restore(data)
+        return world
+
+    def pool_stats(self):
+        """Returns the hit, miss and high-water counters of the bullet and asteroid pools."""
+        stats = self.bullet_store.pool_stats()
+        stats.update(self.asteroid_store.pool_stats())
+        return stats
+
+    def spawn_wave(self, count, speed=constants.BIG_ROCK_SPEED):
+        """Adds a wave of big rocks, keeping them clear of the first living ship.
+        With every ship dead, rocks are kept clear of the middle of the screen."""
+        safe_x = constants.SCREEN_WIDTH / 2
+        safe_y = constants.SCREEN_HEIGHT / 2
+        for player in self.players:
+            if player.ship.alive:
+                safe_x = player.ship.center.x
+                safe_y = player.ship.center.y
+                break
+        spawn = self.asteroid_store.spawn
+        rng = self.rng
+        wave = [spawn(Big_Rock, rng, safe_x, safe_y, speed) for number in range(count)]
+        self.asteroids.extend(wave)
+        return wave
+
+    def next_wave(self):
+        """Starts the next wave of endless mode, with more and faster big rocks than the last,
+        never more than the asteroid budget allows."""
+        self.wave += 1
+        count = math.ceil(constants.INITIAL_ROCK_COUNT * constants.WAVE_ROCK_GROWTH ** (self.wave - 1))
+        speed = min(constants.BIG_ROCK_SPEED * (1 + constants.WAVE_SPEED_GROWTH * (self.wave - 1)),
+                    constants.BIG_ROCK_MAX_SPEED)
+        return self.spawn_wave(min(count, self.budget - self.asteroid_store.count), speed)
+
+    def check_presses(self, player, pressed):
+        """Handles a player's inputs that act once when pressed, rather than while held."""
+        if self.ship_controllable(player):
+            # Fire bullet!
+            if pressed & constants.INPUT_FIRE:
+                self.fire(player)
+        # Once the game is over, look for a restart
+        elif self.state == constants.STATE_GAME_OVER:
+            if pressed & constants.INPUT_RESTART:
+                self.reset_game()
+
+    def check_keys(self, player, held):
+        """
+        This function checks for a player's inputs that are being held down.
+        Parameters are positive to indicate one direction; negative for the opposite.
+        A wrecked ship, or any ship once the game is over, ignores them.
+        """
+        ship = player.ship
+        if not self.ship_controllable(player):
+            ship.thrusters_on = False
+            return
+
+        if held & constants.INPUT_TURN_LEFT:
+            ship.turn(1)
+
+        if held & constants.INPUT_TURN_RIGHT:
+            ship.turn(-1)
+
+        if held & constants.INPUT_THRUST:
+            ship.thrust(1)
+
+        if held & constants.INPUT_REVERSE:
+            ship.thrust(-1)
+
+        # Causes thrusters to disappear once neither thrust input is held
+        if not held & (constants.INPUT_THRUST | constants.INPUT_REVERSE):
+            ship.thrusters_on = False
+
+        # Machine gun mode...
+        if held & constants.INPUT_FIRE:
+            # Check if the firing cooldown is good, then fire
+            if ship.firing_cooldown >= constants.FIRING_COOLDOWN:
+                self.fire(player)
+
+    def ship_controllable(self, player):
+        """Returns whether a player's ship answers to their inputs: it must be alive, in a game that is not over."""
+        return player.ship.alive and self.state != constants.STATE_GAME_OVER
+
+    def fire(self, player):
+        """Fires a bullet from a player's ship, marked as theirs so they score what it hits."""
+        bullet = player.ship.fire(self.bullet_store)
+        bullet.owner = player.number
+        self.bullets.append(bullet)
+
+    def check_collisions(self):
+        """A function that checks if anything has collided."""
+        asteroid_store = self.asteroid_store
+        bullet_store = self.bullet_store
+        rows = asteroid_store.live_indices()
+
+        # Checks every asteroid against each ship in one pass, along the paths both took last frame;
+        # the circles around their hit shapes rule out most rocks, and only the rocks left are tested shape to shape
+        motion_x, motion_y = asteroid_store.motion()
+        for player in self.players:
+            ship = player.ship
+            if ship.alive and len(rows):
+                hitbox = load_hitbox(ship.texture_path)
+                offset_x = minimum_image(asteroid_store.x[rows] - ship.center.x, constants.SCREEN_WIDTH)
+                offset_y = minimum_image(asteroid_store.y[rows] - ship.center.y, constants.SCREEN_HEIGHT)
+                relative_x = motion_x[rows] - ship.velocity.dx
+                relative_y = motion_y[rows] - ship.velocity.dy
+                near = np.flatnonzero(circles_meet(offset_x, offset_y, relative_x, relative_y,
+                                                   hitbox.radius + asteroid_store.radius[rows]))
+                if len(near) and np.any(shapes_meet(
+                        asteroid_store.shape[rows[near]], asteroid_store.angle[rows[near]],
+                        np.full(len(near), hitbox.index), np.full(len(near), float(ship.angle)),
+                        offset_x[near], offset_y[near], relative_x[near], relative_y[near])):
+                    ship.hit()
+                    player.lives_lost += 1
+
+        # Checks asteroids against bullets; fragments made by a hit are checked in a later pass,
+        # just as they would be reached after every older asteroid in the list.
+        # Paths are swept, so fast bullets and fragments can't pass through a small rock between frames
+        bullet_motion_x, bullet_motion_y = bullet_store.motion()
+        while len(rows):
+            bullet_rows = bullet_store.live_indices()
+            if not len(bullet_rows):
+                break
+            first_new_serial = asteroid_store.next_serial
+            motion_x, motion_y = asteroid_store.motion()
+            hit_asteroids, hit_bullets = self.bullet_hash.overlapping_pairs(
+                    asteroid_store.x[rows], asteroid_store.y[rows], asteroid_store.radius[rows],
+                    bullet_store.x[bullet_rows], bullet_store.y[bullet_rows], bullet_store.radius[bullet_rows],
+                    (motion_x[rows], motion_y[rows]),
+                    (bullet_motion_x[bullet_rows], bullet_motion_y[bullet_rows]))
+
+            # Of the pairs whose circles touched, only those whose hit shapes overlapped count as hits.
+            # Pairs the cheap checks can't settle get the exact test once they are reached with both objects alive
+            pair_asteroids = rows[hit_asteroids]
+            pair_bullets = bullet_rows[hit_bullets]
+            if not len(pair_asteroids):
+                # No hits means no fragments for a later pass
+                break
+            pairs = (asteroid_store.shape[pair_asteroids], asteroid_store.angle[pair_asteroids],
+                     bullet_store.shape[pair_bullets], bullet_store.angle[pair_bullets],
+                     minimum_image(asteroid_store.x[pair_asteroids] - bullet_store.x[pair_bullets],
+                                   constants.SCREEN_WIDTH),
+                     minimum_image(asteroid_store.y[pair_asteroids] - bullet_store.y[pair_bullets],
+                                   constants.SCREEN_HEIGHT),
+                     motion_x[pair_asteroids] - bullet_motion_x[pair_bullets],
+                     motion_y[pair_asteroids] - bullet_motion_y[pair_bullets])
+            near, sure = narrow(pairs[0], pairs[2], *pairs[3:])
+            pair_asteroids = pair_asteroids[near]
+            pair_bullets = pair_bullets[near]
+            pairs = tuple(values[near] for values in pairs)
+            # 1 for a hit, 0 for a miss and -1 until the exact test has been run
+            outcomes = np.where(sure[near], 1, -1)
+
+            for number, (asteroid_row, bullet_row) in enumerate(zip(pair_asteroids, pair_bullets)):
+                if bullet_store.alive[bullet_row] and asteroid_store.alive[asteroid_row]:
+                    if outcomes[number] < 0:
+                        self.resolve_pairs(outcomes, number, pair_asteroids, pair_bullets, pairs)
+                    if not outcomes[number]:
+                        continue
+                    bullet_store.alive[bullet_row] = False
+                    # Kills asteroid; adds smaller asteroids based on which asteroid was killed
+                    asteroid = asteroid_store.handle(asteroid_row)
+                    self.players[bullet_store.handle(bullet_row).owner].score += asteroid.points
+                    self.pending_asteroids.extend(asteroid.break_apart(self.budget - asteroid_store.count))
+
+            rows = asteroid_store.live_indices()
+            rows = rows[asteroid_store.serial[rows] >= first_new_serial]
+
+        # Adds the fragments once every pass is done, then cleans up any destroyed objects
+        self.merge_pending()
+        self.cleanup_zombies()
+        if len(self.asteroids) > self.budget * constants.MERGE_FRACTION:
+            self.merge_small_rocks()
+
+    def resolve_pairs(self, outcomes, number, pair_asteroids, pair_bullets, pairs):
+        """Runs the exact test on the unsettled pair number, and on the next few unsettled pairs whose asteroid and bullet
+        are still alive, up to HITBOX_BATCH in all, storing each outcome."""
+        later = np.arange(number, len(outcomes))
+        later = later[(outcomes[number:] < 0) & self.asteroid_store.alive[pair_asteroids[number:]]
+                      & self.bullet_store.alive[pair_bullets[number:]]][:constants.HITBOX_BATCH]
+        outcomes[later] = exact_meet(*(values[later] for values in pairs))
+
+    def merge_small_rocks(self):
+        """Merges small rocks that have drifted within MERGE_DISTANCE of each other, so crowded fields thin out.
+        Of each pair, the rock earlier in the asteroid list survives with the pair's average velocity;
+        a rock merges at most once per tick."""
+        small_rocks = [asteroid for asteroid in self.asteroids if type(asteroid) is Small_Rock]
+        if len(small_rocks) < 2:
+            return
+        store = self.asteroid_store
+        rows = np.array([rock.index for rock in small_rocks])
+        x = store.x[rows]
+        y = store.y[rows]
+        reach = np.full(len(rows), constants.MERGE_DISTANCE / 2)
+        first, second = self.merge_hash.overlapping_pairs(x, y, reach, x, y, reach)
+
+        merged = np.zeros(len(rows), dtype=bool)
+        for keep, drop in zip(first[first < second], second[first < second]):
+            if merged[keep] or merged[drop]:
+                continue
+            merged[keep] = merged[drop] = True
+            keep_row = rows[keep]
+            drop_row = rows[drop]
+            store.dx[keep_row] = (store.dx[keep_row] + store.dx[drop_row]) / 2
+            store.dy[keep_row] = (store.dy[keep_row] + store.dy[drop_row]) / 2
+            store.alive[drop_row] = False
+        self.remove_dead(self.asteroids)
+
+    def merge_pending(self):
+        """Moves asteroids spawned during this tick into the asteroid list."""
+        if self.pending_asteroids:
+            self.asteroids.extend(self.pending_asteroids)
+            self.pending_asteroids.clear()
+
+    def cleanup_zombies(self):
+        """A function to remove dead objects, giving their rows back to the stores."""
+        self.remove_dead(self.asteroids)
+        self.remove_dead(self.bullets)
+
+    def remove_dead(self, objects):
+        """Compacts a list in one pass, sliding living objects down over dead ones and keeping their order."""
+        kept = 0
+        for flying_object in objects:
+            if flying_object.alive:
+                objects[kept] = flying_object
+                kept += 1
+            else:
+                flying_object.release()
+        del objects[kept:]
+
+    def check_resets(self):
+        """Advances the game's state machine by one tick: counts down ship respawns, and the next wave or the end of
+        the game once the field is clear. A game that is over stays over without doing anything, until it is restarted."""
+        if self.state == constants.STATE_GAME_OVER:
+            return
+
+        ship_alive = False
+        for player in self.players:
+            # If ship is dead
+            if not player.ship.alive:
+                player.reset_counter += 1
+                # If ship still has lives, prepare a reset of the ship
+                if player.reset_counter >= constants.RESET_COUNTER and player.ship.lives > 0:
+                    player.respawn()
+                    player.reset_counter = 0
+            else:
+                ship_alive = True
+
+        # If all asteroids are destoyed while a ship is flying
+        if ship_alive and len(self.asteroids) == 0:
+            self.reset_counter += 1
+            # Endless mode sends another wave
+            if self.endless and self.reset_counter >= constants.WAVE_DELAY:
+                self.next_wave()
+                self.reset_counter = 0
+
+        # Checks for game over due to every ship's total destruction, or the asteroids' destruction
+        if self.try_end_game():
+            return
+
+        if not any(player.ship.alive for player in self.players):
+            self.state = constants.STATE_RESPAWNING
+        elif len(self.asteroids) == 0:
+            self.state = constants.STATE_WAVE_CLEAR
+        else:
+            self.state = constants.STATE_PLAYING
+
+    def try_end_game(self):
+        """If reset_counter criteria is reached, for every player or for the cleared field outside endless mode:
+        ends the game, so the view can display the game over screen. Returns whether the game ended."""
+        ships_destroyed = all(player.out and player.reset_counter >= constants.GAME_RESET_COUNTER
+                              for player in self.players)
+        field_cleared = not self.endless and self.reset_counter >= constants.GAME_RESET_COUNTER
+        if not (ships_destroyed or field_cleared):
+            return False
+        # Game over is flagged, and all items cleared, once
+        self.asteroids.clear()
+        self.asteroid_store.clear()
+        for player in self.players:
+            player.ship.alive = False
+            player.ship.lives = 0
+        self.state = constants.STATE_GAME_OVER
+        return True
+
+    def reset_game(self):
+        """Resets ships, life counts, counters and asteroids for a new game."""
+        self.state = constants.STATE_PLAYING
+        self.reset_counter = 0
+        self.wave = 1
+        for player in self.players:
+            player.reset_counter = 0
+            player.score = 0
+            player.lives_lost = 0
+            player.respawn()
+            player.ship.lives = constants.SHIP_LIVES
+
+        self.asteroid_store.clear()
+        self.asteroids = []
+        self.spawn_wave(constants.INITIAL_ROCK_COUNT)
+
+    # Getter properties are listed below
+    @property
+    def game_over(self):
+        """True once the game has ended, until it is restarted."""
+        return self.state == constants.STATE_GAME_OVER
+
+    @property
+    def ship(self):
+        """The first player's ship."""
+        return self.players[0].ship
+
+    @property
+    def score(self):
+        """Points scored by every player together."""
+        return sum(player.score for player in self.players)
+
+    @property
+    def lives_lost(self):
+        """Ships lost by every player together."""
+        return sum(player.lives_lost for player in self.players)